@@ -1,8 +1,19 @@
 from flask import Flask, render_template
+import os
+from test_back.rate_limiter import init_rate_limiter
+from test_back.metrics import init_metrics
 
 app = Flask(__name__)
 
-app.config['DEBUG'] = True
+# IP별 요청 제한
+rate_limiter = init_rate_limiter(app)
+
+# 라우트별 요청 수/지연 시간 계측 (/metrics, /debug/profile)
+metrics = init_metrics(app)
+
+# 디버그 모드는 기본으로 꺼져 있으며 FLASK_DEBUG=1로 켬 (여러 워커로 실행할 때는 serve.py가 항상 끔)
+# 예) python test_back/serve.py app:app --workers 4
+app.config['DEBUG'] = os.environ.get('FLASK_DEBUG', 'false').lower() in ('true', '1', 'yes', 'y')
 
 @app.route('/')
 def home():
@@ -18,4 +29,5 @@ def test():
     return result
 
 if __name__ == '__main__':
-    app.run(host='0.0.0.0', port=5000)
\ No newline at end of file
+    port = int(os.environ.get('PORT', 5000))
+    app.run(host='0.0.0.0', port=port)
\ No newline at end of file
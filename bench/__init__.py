@@ -0,0 +1,11 @@
+"""
+로컬 HTTP 벤치마크.
+
+app.py, prod_server.py, dev_server.py, attack.py를 임시 포트로 각각 띄운 뒤
+내장 asyncio 부하 생성기로 엔드포인트별 처리량과 p50/p95/p99 지연 시간을 측정합니다.
+getPdfName.py처럼 짧게 실행되는 스크립트의 콜드 스타트 시간도 함께 기록합니다.
+
+    python -m bench run --output results.json
+    python -m bench compare base.json results.json --threshold 0.1
+    python -m bench pages prod_server --requests 2000
+"""
@@ -0,0 +1,51 @@
+import argparse
+import sys
+
+from bench.compare import compare, format_rows, load_results
+from bench.pages import run_pages
+from bench.runner import SCENARIOS, run_all
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m bench", description="로컬 HTTP 벤치마크")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="벤치마크 실행")
+    run.add_argument("--output", default="bench_results.json", help="결과 JSON 파일")
+    run.add_argument("--only", default="", help="실행할 시나리오 (쉼표 구분: "
+                     + ",".join([s["name"] for s in SCENARIOS] + ["coldstart"]) + ")")
+    run.add_argument("--concurrency", type=int, default=16, help="동시 연결 수")
+    run.add_argument("--duration", type=float, default=5.0, help="엔드포인트별 측정 시간(초)")
+    run.add_argument("--warmup", type=float, default=1.0, help="엔드포인트별 워밍업 시간(초)")
+
+    cmp = commands.add_parser("compare", help="두 결과 파일 비교")
+    cmp.add_argument("base", help="기준 결과 JSON")
+    cmp.add_argument("new", help="비교할 결과 JSON")
+    cmp.add_argument("--threshold", type=float, default=0.10, help="회귀로 판단할 변화 비율 (기본 0.10)")
+
+    pages = commands.add_parser("pages", help="고정 페이지 캐시 전후 처리량 비교 (Flask 테스트 클라이언트)")
+    pages.add_argument("module", nargs="?", default="prod_server", choices=["prod_server", "dev_server"])
+    pages.add_argument("--requests", type=int, default=2000, help="경로별 요청 수")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        names = [name for name in args.only.split(",") if name]
+        report = run_all(args.output, names, args.concurrency, args.duration, args.warmup)
+        return 1 if report.get("failed") else 0
+
+    if args.command == "pages":
+        run_pages(args.module, args.requests)
+        return 0
+
+    rows, regressions = compare(load_results(args.base), load_results(args.new), args.threshold)
+    print(format_rows(rows))
+    if regressions:
+        print(f"\n성능 회귀 {len(regressions)}건 발견")
+        return 1
+    print("\n성능 회귀 없음")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
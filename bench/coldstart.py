@@ -0,0 +1,57 @@
+"""스크립트 모듈의 콜드 스타트(인터프리터 시작 + import) 시간 측정"""
+import os
+import subprocess
+import sys
+import time
+
+from bench.loadgen import percentile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 측정 대상: (결과 키, 실행할 코드)
+TARGETS = [
+    ("coldstart python", "pass"),
+    ("coldstart import getPdfName", "import getPdfName"),
+]
+
+
+def measure(code, runs=20):
+    """새 인터프리터에서 code를 runs회 실행한 소요 시간 통계"""
+    timings = []
+    errors = 0
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = subprocess.run([sys.executable, "-c", code], cwd=ROOT,
+                                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        elapsed = time.perf_counter() - start
+        if result.returncode != 0:
+            errors += 1
+            continue
+        timings.append(elapsed)
+
+    timings.sort()
+    to_ms = lambda value: round(value * 1000, 3) if value is not None else None
+    total = sum(timings)
+    return {
+        "requests": len(timings),
+        "errors": errors,
+        "duration_s": round(total, 3),
+        "throughput_rps": round(len(timings) / total, 1) if total > 0 else 0.0,
+        "latency_ms": {
+            "mean": to_ms(total / len(timings)) if timings else None,
+            "p50": to_ms(percentile(timings, 50)),
+            "p95": to_ms(percentile(timings, 95)),
+            "p99": to_ms(percentile(timings, 99)),
+            "max": to_ms(timings[-1] if timings else None),
+        },
+    }
+
+
+def run_coldstart(runs=20):
+    results = {}
+    for key, code in TARGETS:
+        print(f"측정 중: {key}")
+        result = measure(code, runs)
+        print(f"  p50 {result['latency_ms']['p50']}ms, 오류 {result['errors']}")
+        results[key] = result
+    return results
@@ -0,0 +1,78 @@
+"""두 벤치마크 결과 파일을 비교하여 성능 저하 항목을 표시"""
+import json
+
+
+def load_results(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _change(base, new):
+    if not base or new is None:
+        return None
+    return (new - base) / base
+
+
+def compare(base_report, new_report, threshold=0.10):
+    """
+    항목별 처리량/지연 시간 변화를 비교합니다.
+    처리량이 threshold 비율 이상 줄었거나 p95/p99 지연이 threshold 비율 이상 늘면 회귀로 판단합니다.
+    (행 목록, 회귀 항목 목록)을 반환합니다.
+    """
+    base_results = base_report.get("results", {})
+    new_results = new_report.get("results", {})
+    rows = []
+    regressions = []
+
+    for key in sorted(set(base_results) | set(new_results)):
+        base = base_results.get(key)
+        new = new_results.get(key)
+        if base is None or new is None:
+            rows.append({"key": key, "status": "새 항목" if base is None else "누락"})
+            continue
+
+        throughput = _change(base["throughput_rps"], new["throughput_rps"])
+        p95 = _change(base["latency_ms"]["p95"], new["latency_ms"]["p95"])
+        p99 = _change(base["latency_ms"]["p99"], new["latency_ms"]["p99"])
+
+        reasons = []
+        if throughput is not None and throughput <= -threshold:
+            reasons.append(f"처리량 {throughput:+.1%}")
+        if p95 is not None and p95 >= threshold:
+            reasons.append(f"p95 {p95:+.1%}")
+        if p99 is not None and p99 >= threshold:
+            reasons.append(f"p99 {p99:+.1%}")
+        if new.get("errors", 0) > base.get("errors", 0):
+            reasons.append(f"오류 {base.get('errors', 0)} -> {new['errors']}")
+
+        row = {
+            "key": key,
+            "status": "회귀" if reasons else "정상",
+            "throughput": (base["throughput_rps"], new["throughput_rps"], throughput),
+            "p99": (base["latency_ms"]["p99"], new["latency_ms"]["p99"], p99),
+            "reasons": reasons,
+        }
+        rows.append(row)
+        if reasons:
+            regressions.append(row)
+
+    return rows, regressions
+
+
+def format_rows(rows):
+    fmt = lambda change: f"{change:+.1%}" if change is not None else "-"
+    lines = [f"{'항목':<36}{'처리량(req/s)':>28}{'p99(ms)':>28}  상태"]
+    for row in rows:
+        if "throughput" not in row:
+            lines.append(f"{row['key']:<36}{'':>28}{'':>28}  {row['status']}")
+            continue
+        base_tp, new_tp, tp = row["throughput"]
+        base_p99, new_p99, p99 = row["p99"]
+        status = row["status"]
+        if row["reasons"]:
+            status += " (" + ", ".join(row["reasons"]) + ")"
+        lines.append(
+            f"{row['key']:<36}{f'{base_tp} -> {new_tp} ({fmt(tp)})':>28}"
+            f"{f'{base_p99} -> {new_p99} ({fmt(p99)})':>28}  {status}"
+        )
+    return "\n".join(lines)
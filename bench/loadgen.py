@@ -0,0 +1,146 @@
+"""asyncio 기반 HTTP/1.1 부하 생성기 (keep-alive 연결 재사용)"""
+import asyncio
+import time
+
+
+def build_request(method, path, host, port, body=None, content_type=None):
+    """원시 HTTP/1.1 요청 바이트 생성"""
+    if isinstance(body, str):
+        body = body.encode("utf-8")
+    lines = [
+        f"{method} {path} HTTP/1.1",
+        f"Host: {host}:{port}",
+        "User-Agent: bench",
+        "Accept: */*",
+        "Connection: keep-alive",
+    ]
+    if body is not None:
+        lines.append(f"Content-Type: {content_type or 'application/octet-stream'}")
+        lines.append(f"Content-Length: {len(body)}")
+    head = ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+    return head + (body or b"")
+
+
+async def read_response(reader):
+    """
+    응답 하나를 끝까지 읽습니다.
+    (상태 코드, 연결 재사용 가능 여부)를 반환합니다.
+    """
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionError("서버가 연결을 닫았습니다")
+    version, status = status_line.split()[:2]
+    status = int(status)
+
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        key, _, value = line.decode("latin-1").partition(":")
+        headers[key.strip().lower()] = value.strip().lower()
+
+    if version == b"HTTP/1.0":
+        keep_alive = headers.get("connection") == "keep-alive"
+    else:
+        keep_alive = headers.get("connection") != "close"
+
+    if status in (204, 304) or 100 <= status < 200:
+        pass
+    elif "content-length" in headers:
+        await reader.readexactly(int(headers["content-length"]))
+    elif headers.get("transfer-encoding") == "chunked":
+        while True:
+            size = int((await reader.readline()).split(b";")[0], 16)
+            if size == 0:
+                while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    pass
+                break
+            await reader.readexactly(size + 2)
+    else:
+        # 길이 정보가 없으면 연결 종료까지 읽음
+        await reader.read()
+        keep_alive = False
+
+    return status, keep_alive
+
+
+async def _worker(host, port, payload, deadline, latencies, statuses, counters):
+    reader = writer = None
+    while time.perf_counter() < deadline:
+        try:
+            if writer is None:
+                reader, writer = await asyncio.open_connection(host, port)
+            start = time.perf_counter()
+            writer.write(payload)
+            await writer.drain()
+            status, keep_alive = await read_response(reader)
+        except (OSError, asyncio.IncompleteReadError, ValueError, IndexError):
+            counters["errors"] += 1
+            if writer is not None:
+                writer.close()
+            reader = writer = None
+            await asyncio.sleep(0.01)
+            continue
+
+        if latencies is not None:
+            latencies.append(time.perf_counter() - start)
+            statuses[status] = statuses.get(status, 0) + 1
+            if status >= 400:
+                counters["errors"] += 1
+
+        if not keep_alive:
+            writer.close()
+            reader = writer = None
+
+    if writer is not None:
+        writer.close()
+
+
+def percentile(sorted_values, pct):
+    """정렬된 값 목록의 nearest-rank 백분위수"""
+    if not sorted_values:
+        return None
+    index = max(0, min(len(sorted_values) - 1, int(round(pct / 100 * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+async def run_load(host, port, payload, concurrency=16, duration=5.0, warmup=1.0):
+    """
+    concurrency개의 연결로 duration초 동안 같은 요청을 반복 전송하고
+    처리량과 지연 시간 통계를 반환합니다. warmup초 동안의 결과는 버립니다.
+    """
+    if warmup > 0:
+        deadline = time.perf_counter() + warmup
+        await asyncio.gather(*[
+            _worker(host, port, payload, deadline, None, None, {"errors": 0})
+            for _ in range(concurrency)
+        ])
+
+    latencies = []
+    statuses = {}
+    counters = {"errors": 0}
+    start = time.perf_counter()
+    deadline = start + duration
+    await asyncio.gather(*[
+        _worker(host, port, payload, deadline, latencies, statuses, counters)
+        for _ in range(concurrency)
+    ])
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    to_ms = lambda value: round(value * 1000, 3) if value is not None else None
+    return {
+        "requests": len(latencies),
+        "errors": counters["errors"],
+        "statuses": {str(code): count for code, count in sorted(statuses.items())},
+        "duration_s": round(elapsed, 3),
+        "throughput_rps": round(len(latencies) / elapsed, 1) if elapsed > 0 else 0.0,
+        "latency_ms": {
+            "mean": to_ms(sum(latencies) / len(latencies)) if latencies else None,
+            "p50": to_ms(percentile(latencies, 50)),
+            "p95": to_ms(percentile(latencies, 95)),
+            "p99": to_ms(percentile(latencies, 99)),
+            "max": to_ms(latencies[-1] if latencies else None),
+        },
+    }
@@ -0,0 +1,65 @@
+"""고정 페이지 캐시(CachedPage) 전후 처리량 비교"""
+import importlib
+import os
+import sys
+import time
+
+from bench.runner import ROOT
+
+PAGES = {
+    "/": "INDEX_PAGE",
+    "/comments": "COMMENTS_PAGE",
+}
+
+
+def measure(client, path, count, headers=None):
+    """count회 요청 후 초당 요청 수를 반환"""
+    client.get(path, headers=headers)  # 워밍업
+    start = time.perf_counter()
+    for _ in range(count):
+        client.get(path, headers=headers)
+    return count / (time.perf_counter() - start)
+
+
+def run_pages(module_name="prod_server", count=2000):
+    """
+    Flask 테스트 클라이언트로 '/'와 '/comments'를 반복 호출하여
+    - 요청마다 템플릿을 렌더링하던 기존 방식 (before)
+    - 미리 렌더링된 CachedPage 응답 (after, after-gzip)
+    - ETag 재검증으로 304를 받는 경우 (after-304)
+    의 초당 요청 수를 출력합니다. 네트워크 비용을 제외한 앱 내부 처리량만 측정하므로
+    서버를 띄우는 `run` 결과와는 따로 출력만 합니다.
+    """
+    from flask import render_template_string
+
+    # 벤치마크 중에는 요청 제한 비활성화
+    os.environ["RATE_LIMIT"] = "0"
+    sys.path.insert(0, os.path.join(ROOT, "test_back"))
+    module = importlib.import_module(module_name)
+    app = module.app
+    app.debug = False
+
+    # 기존 방식과 동일하게 요청마다 템플릿을 컴파일하는 비교용 라우트
+    def uncached(name):
+        def view():
+            return render_template_string(getattr(module, name).source)
+        return view
+
+    for path, name in PAGES.items():
+        app.add_url_rule("/_bench" + path, "bench_" + name, uncached(name))
+
+    client = app.test_client()
+    results = {}
+    print(f"{module_name}: 경로별 {count}회 요청")
+    print(f"{'경로':<12}{'before':>12}{'after':>12}{'after-gzip':>12}{'after-304':>12}")
+    for path, name in PAGES.items():
+        page = getattr(module, name)
+        row = {
+            "before": measure(client, "/_bench" + path, count),
+            "after": measure(client, path, count),
+            "after-gzip": measure(client, path, count, {"Accept-Encoding": "gzip"}),
+            "after-304": measure(client, path, count, {"If-None-Match": f'"{page.etag}"'}),
+        }
+        print(f"{path:<12}" + "".join(f"{value:>12.0f}" for value in row.values()))
+        results[path] = row
+    return results
@@ -0,0 +1,233 @@
+"""각 서버를 임시 포트로 띄우고 엔드포인트별 부하를 측정"""
+import asyncio
+import json
+import os
+import platform
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+from bench.coldstart import run_coldstart
+from bench.loadgen import build_request, run_load
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+FORM = "application/x-www-form-urlencoded"
+JSON = "application/json"
+
+# 서버별 측정 대상 엔드포인트
+# 본문과 환경 변수의 {upstream}은 스텁 업스트림 주소(host:port)로 치환됨
+SCENARIOS = [
+    {
+        "name": "app",
+        "script": "app.py",
+        "endpoints": [
+            {"method": "GET", "path": "/"},
+            {"method": "GET", "path": "/test"},
+        ],
+    },
+    {
+        "name": "prod",
+        "script": os.path.join("test_back", "prod_server.py"),
+        "endpoints": [
+            {"method": "GET", "path": "/"},
+            {"method": "POST", "path": "/login", "body": "username=bench&password=bench", "content_type": FORM},
+            {"method": "GET", "path": "/comments"},
+            {"method": "POST", "path": "/comments", "body": "comment=hello", "content_type": FORM},
+        ],
+    },
+    {
+        "name": "dev",
+        "script": os.path.join("test_back", "dev_server.py"),
+        "endpoints": [
+            {"method": "GET", "path": "/"},
+            {"method": "POST", "path": "/login", "body": "username=bench&password=bench", "content_type": FORM},
+            {"method": "GET", "path": "/comments"},
+            {"method": "GET", "path": "/logs"},
+            {"method": "POST", "path": "/api/login",
+             "body": json.dumps({"source": "bench", "method": "POST", "path": "/api/login"}), "content_type": JSON},
+        ],
+    },
+    {
+        "name": "attack",
+        "script": os.path.join("test_back", "attack.py"),
+        "upstream": True,
+        # 라우팅 테이블의 기본 대상을 스텁 업스트림으로 지정
+        "env": {"FORWARD_URL": "http://{upstream}/api/log"},
+        "endpoints": [
+            {"method": "GET", "path": "/"},
+            {"method": "POST", "path": "/api/log",
+             "body": json.dumps({"source": "bench", "method": "GET", "path": "/", "headers": {"Host": "{upstream}"}}),
+             "content_type": JSON},
+        ],
+    },
+]
+
+
+def free_port():
+    """사용 가능한 임시 포트 번호"""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_for_port(port, proc, timeout=20.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"프로세스가 종료되었습니다 (exit {proc.returncode})")
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.2):
+                return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f"{timeout}초 안에 포트 {port}가 열리지 않았습니다")
+
+
+class LocalProcess:
+    """서버 프로세스를 띄우고 종료 시 프로세스 그룹 전체를 정리"""
+
+    def __init__(self, args, port, cwd, env=None, log_path=None):
+        self.args = args
+        self.port = port
+        self.cwd = cwd
+        self.env = env
+        self.log_path = log_path
+        self.proc = None
+        self._log = None
+
+    def start(self):
+        self._log = open(self.log_path, "wb") if self.log_path else subprocess.DEVNULL
+        self.proc = subprocess.Popen(
+            self.args, cwd=self.cwd, env=self.env,
+            stdout=self._log, stderr=subprocess.STDOUT,
+            start_new_session=hasattr(os, "setsid"),
+        )
+        try:
+            wait_for_port(self.port, self.proc)
+        except Exception:
+            self.stop()
+            raise
+        return self
+
+    def stop(self):
+        if self.proc.poll() is None:
+            # 디버그 리로더가 만든 자식 프로세스까지 함께 종료
+            if hasattr(os, "killpg"):
+                os.killpg(self.proc.pid, signal.SIGTERM)
+            else:
+                self.proc.terminate()
+            try:
+                self.proc.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                if hasattr(os, "killpg"):
+                    os.killpg(self.proc.pid, signal.SIGKILL)
+                else:
+                    self.proc.kill()
+                self.proc.wait()
+        if self._log not in (None, subprocess.DEVNULL):
+            self._log.close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def server_env(port):
+    env = dict(os.environ)
+    env.update({
+        "PORT": str(port),
+        "WORKERS": "1",
+        "FLASK_DEBUG": "0",
+        "RATE_LIMIT": "0",  # 벤치마크 트래픽이 요청 제한에 걸리지 않도록
+        "PYTHONUNBUFFERED": "1",
+    })
+    return env
+
+
+def run_scenario(scenario, workdir, concurrency, duration, warmup):
+    """서버 하나를 띄워 모든 엔드포인트를 측정"""
+    results = {}
+    port = free_port()
+    script = os.path.join(ROOT, scenario["script"])
+    log_path = os.path.join(workdir, f"{scenario['name']}.log")
+
+    upstream = None
+    if scenario.get("upstream"):
+        upstream_port = free_port()
+        upstream = LocalProcess(
+            [sys.executable, "-m", "bench.stub", "--port", str(upstream_port)],
+            upstream_port, cwd=ROOT,
+        ).start()
+
+    try:
+        env = server_env(port)
+        for key, value in scenario.get("env", {}).items():
+            env[key] = value.replace("{upstream}", f"127.0.0.1:{upstream.port}") if upstream else value
+        server = LocalProcess([sys.executable, script], port, cwd=workdir, env=env, log_path=log_path)
+        try:
+            server.start()
+        except RuntimeError as e:
+            with open(log_path, encoding="utf-8", errors="replace") as f:
+                tail = f.read()[-2000:]
+            raise RuntimeError(f"{e}\n{tail}") from None
+        try:
+            for endpoint in scenario["endpoints"]:
+                body = endpoint.get("body")
+                if body is not None and upstream is not None:
+                    body = body.replace("{upstream}", f"127.0.0.1:{upstream.port}")
+                payload = build_request(endpoint["method"], endpoint["path"], "127.0.0.1", port,
+                                        body=body, content_type=endpoint.get("content_type"))
+                key = f"{scenario['name']} {endpoint['method']} {endpoint['path']}"
+                print(f"측정 중: {key}")
+                result = asyncio.run(run_load("127.0.0.1", port, payload, concurrency, duration, warmup))
+                print(f"  {result['throughput_rps']} req/s, p50 {result['latency_ms']['p50']}ms, "
+                      f"p99 {result['latency_ms']['p99']}ms, 오류 {result['errors']}")
+                results[key] = result
+        finally:
+            server.stop()
+    finally:
+        if upstream is not None:
+            upstream.stop()
+    return results
+
+
+def run_all(output_file, names=None, concurrency=16, duration=5.0, warmup=1.0):
+    """선택한 시나리오를 모두 실행하고 결과를 JSON 파일로 저장"""
+    report = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "concurrency": concurrency,
+            "duration_s": duration,
+            "warmup_s": warmup,
+        },
+        "results": {},
+    }
+
+    with tempfile.TemporaryDirectory(prefix="bench-") as workdir:
+        for scenario in SCENARIOS:
+            if names and scenario["name"] not in names:
+                continue
+            try:
+                report["results"].update(run_scenario(scenario, workdir, concurrency, duration, warmup))
+            except RuntimeError as e:
+                print(f"{scenario['name']} 시나리오 실패: {e}")
+                report.setdefault("failed", []).append(scenario["name"])
+
+    # 스크립트 시작 시간 (getPdfName 등 짧게 실행되는 도구의 import 비용)
+    if not names or "coldstart" in names:
+        report["results"].update(run_coldstart())
+
+    with open(output_file, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    print(f"결과가 '{output_file}'에 저장되었습니다.")
+    return report
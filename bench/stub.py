@@ -0,0 +1,54 @@
+"""
+attack.py 전달 대상으로 쓰이는 로컬 스텁 업스트림 서버.
+
+사용법: python -m bench.stub --port PORT
+모든 요청에 200 OK와 짧은 본문으로 응답하며 keep-alive를 지원합니다.
+"""
+import asyncio
+import sys
+
+RESPONSE = b"HTTP/1.1 200 OK\r\nContent-Type: text/plain\r\nContent-Length: 2\r\n\r\nok"
+
+
+async def _handle(reader, writer):
+    try:
+        while True:
+            headers = {}
+            request_line = await reader.readline()
+            if not request_line:
+                break
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                key, _, value = line.decode("latin-1").partition(":")
+                headers[key.strip().lower()] = value.strip().lower()
+            length = int(headers.get("content-length", 0))
+            if length:
+                await reader.readexactly(length)
+            writer.write(RESPONSE)
+            await writer.drain()
+            if headers.get("connection") == "close":
+                break
+    except (ConnectionError, asyncio.IncompleteReadError):
+        pass
+    finally:
+        writer.close()
+
+
+async def serve(host, port):
+    server = await asyncio.start_server(_handle, host, port)
+    async with server:
+        await server.serve_forever()
+
+
+def main():
+    port = 0
+    for i in range(1, len(sys.argv) - 1):
+        if sys.argv[i] == "--port":
+            port = int(sys.argv[i + 1])
+    asyncio.run(serve("127.0.0.1", port))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,17 @@
 import os
 import sys
 import time
-import pandas as pd
+import mmap
+import json
+import hashlib
+import zlib
 from datetime import datetime
 import re
 
+# PDF 메타데이터에서 날짜를 찾을 때 읽는 범위 (파일 끝 / 파일 앞)
+PDF_TAIL_BYTES = 1024 * 1024
+PDF_HEAD_BYTES = 64 * 1024
+
 def extract_date_info(filename):
     """
     파일명에서 연도, 월, 일 정보를 추출합니다.
@@ -96,13 +103,316 @@ def extract_date_info(filename):
         'day': None
     }
 
-def find_pdf_files(root_dir):
+def format_date(year, month, day):
+    """
+    연도, 월, 일 정보를 'YYYY-MM-DD', 'YYYY-MM', 'YYYY' 형식의 문자열로 변환합니다.
+    """
+    try:
+        if year and month and day:
+            return f"{year}-{month:02d}-{day:02d}"
+        elif year and month:
+            return f"{year}-{month:02d}"
+        elif year:
+            return f"{year}"
+    except (TypeError, ValueError):
+        pass
+    return '알 수 없음'
+
+def _parse_pdf_date(value):
+    """
+    PDF 날짜 문자열(D:YYYYMMDDHHmmSS 또는 XMP의 YYYY-MM-DD)에서 연도, 월, 일을 추출합니다.
+    """
+    date_info = {'year': None, 'month': None, 'day': None}
+    match = re.search(r'(?:D:)?\s*(\d{4})-?(\d{2})?-?(\d{2})?', value)
+    if not match:
+        return date_info
+    
+    year, month, day = match.groups()
+    if not 1000 <= int(year) <= 2100:
+        return date_info
+    date_info['year'] = int(year)
+    if month and 1 <= int(month) <= 12:
+        date_info['month'] = int(month)
+        if day and 1 <= int(day) <= 31:
+            date_info['day'] = int(day)
+    return date_info
+
+def _decode_pdf_string(raw, is_hex=False):
+    """
+    PDF 문자열 객체(리터럴 또는 16진수)를 텍스트로 변환합니다.
+    """
+    if is_hex:
+        try:
+            raw = bytes.fromhex(re.sub(rb'\s', b'', raw).decode('ascii'))
+        except ValueError:
+            return ''
+    if raw.startswith(b'\xfe\xff'):
+        return raw[2:].decode('utf-16-be', errors='ignore')
+    return raw.decode('latin-1')
+
+# Info 딕셔너리의 /CreationDate (리터럴 또는 16진수 문자열)
+_INFO_DATE_PATTERNS = [
+    (re.compile(rb'/CreationDate\s*\(([^)]{0,128})\)'), False),
+    (re.compile(rb'/CreationDate\s*<([0-9A-Fa-f\s]{0,256})>'), True),
+]
+# XMP 패킷의 xmp:CreateDate (요소 또는 속성 형식)
+_XMP_DATE_PATTERNS = [
+    (re.compile(rb'<xmp:CreateDate>\s*([^<]{0,64})<'), False),
+    (re.compile(rb'xmp:CreateDate\s*=\s*"([^"]{0,64})"'), False),
+]
+
+def _search_pdf_date(data, patterns):
+    for pattern, is_hex in patterns:
+        for match in pattern.finditer(data):
+            date_info = _parse_pdf_date(_decode_pdf_string(match.group(1), is_hex))
+            if date_info['year']:
+                return date_info
+    return None
+
+def _find_xmp_packets(data, start=0, end=None, skip_images=False):
+    """
+    data[start:end]에서 <x:xmpmeta ... </x:xmpmeta> 구간만 반환합니다.
+    주석 등 다른 객체의 /CreationDate가 섞이지 않도록 패킷 밖은 검색하지 않으며,
+    skip_images가 참이면 /Subtype /Image 객체 안에 들어 있는 패킷(이미지 자체의 XMP)은 건너뜁니다.
+    data가 mmap이어도 패킷 부분만 복사합니다.
+    """
+    if end is None:
+        end = len(data)
+    packets = []
+    pos = data.find(b'<x:xmpmeta', start, end)
+    while pos != -1:
+        close = data.find(b'</x:xmpmeta>', pos, end)
+        if close == -1:
+            break
+        if not (skip_images and _inside_image(data, pos)):
+            packets.append(data[pos:close])
+        pos = data.find(b'<x:xmpmeta', close, end)
+    return packets
+
+_IMAGE_SUBTYPE = re.compile(rb'/Subtype\s*/Image\b')
+
+def _inside_image(data, pos):
+    obj = data.rfind(b' obj', 0, pos)
+    if obj == -1 or data.rfind(b'endobj', obj, pos) != -1:
+        return False
+    stream = data.find(b'stream', obj, pos)
+    return _IMAGE_SUBTYPE.search(data, obj, stream if stream != -1 else pos) is not None
+
+def _find_xref_offset(mm, obj_num, xref_offset):
+    """
+    전통적인 xref 테이블에서 객체의 파일 내 위치를 찾습니다.
+    xref 스트림(압축된 상호 참조)은 지원하지 않으므로 None을 반환합니다.
+    """
+    if mm[xref_offset:xref_offset + 4] != b'xref':
+        return None
+    
+    pos = mm.find(b'\n', xref_offset) + 1
+    while 0 < pos < len(mm):
+        end = mm.find(b'\n', pos)
+        if end == -1:
+            return None
+        line = mm[pos:end].strip()
+        if not line or line.startswith(b'trailer'):
+            return None
+        parts = line.split()
+        if len(parts) != 2:
+            return None
+        start, count = int(parts[0]), int(parts[1])
+        pos = end + 1
+        # 각 항목은 20바이트 고정 길이
+        if start <= obj_num < start + count:
+            entry = mm[pos + (obj_num - start) * 20:pos + (obj_num - start) * 20 + 18].split()
+            if len(entry) == 3 and entry[2] == b'n':
+                return int(entry[0])
+            return None
+        pos += count * 20
+    return None
+
+_INFO_REF = re.compile(rb'/Info\s+(\d+)\s+(\d+)\s+R')
+_ROOT_REF = re.compile(rb'/Root\s+(\d+)\s+(\d+)\s+R')
+_METADATA_REF = re.compile(rb'/Metadata\s+(\d+)\s+(\d+)\s+R')
+_STARTXREF = re.compile(rb'startxref\s+(\d+)')
+
+def _last_match(pattern, mm, pos):
+    match = None
+    for match in pattern.finditer(mm, pos):
+        pass
+    return match
+
+def _find_object(mm, tail_start, obj_num, gen_num):
+    """
+    'N G obj' 객체의 파일 내 위치를 반환합니다.
+    xref 테이블을 따라가고, xref 스트림인 경우 파일 끝 구간에서 객체 정의를 직접 검색합니다 (마지막 정의가 최신).
+    """
+    header = re.compile(rb'(?<!\d)%d\s+%d\s+obj\b' % (obj_num, gen_num))
+    startxref = _last_match(_STARTXREF, mm, tail_start)
+    if startxref:
+        try:
+            offset = _find_xref_offset(mm, obj_num, int(startxref.group(1)))
+        except ValueError:
+            offset = None
+        if offset is not None and offset < len(mm) and header.match(mm, offset, offset + 64):
+            return offset
+    match = _last_match(header, mm, tail_start)
+    return match.start() if match else None
+
+def _object_body(mm, start):
+    """start 위치의 'N G obj'부터 endobj 전까지 (최대 4096바이트)"""
+    end = mm.find(b'endobj', start, start + 4096)
+    return mm[start:end if end != -1 else start + 4096]
+
+def _resolve_ref(mm, tail_start, ref):
+    if ref is None:
+        return None
+    return _find_object(mm, tail_start, int(ref.group(1)), int(ref.group(2)))
+
+def _read_info_object(mm, tail_start):
+    """
+    트레일러의 /Info 참조를 따라가 Info 딕셔너리 객체의 본문을 반환합니다.
+    """
+    offset = _resolve_ref(mm, tail_start, _last_match(_INFO_REF, mm, tail_start))
+    return _object_body(mm, offset) if offset is not None else None
+
+def _read_stream(mm, offset):
+    """offset의 스트림 객체 데이터 (FlateDecode는 해제, 다른 필터는 None, 최대 PDF_HEAD_BYTES)"""
+    start = mm.find(b'stream', offset, offset + 4096)
+    if start == -1:
+        return None
+    dictionary = mm[offset:start]
+    start += len(b'stream')
+    if mm[start:start + 2] == b'\r\n':
+        start += 2
+    elif mm[start:start + 1] in (b'\n', b'\r'):
+        start += 1
+    end = mm.find(b'endstream', start, start + PDF_HEAD_BYTES)
+    if end == -1:
+        return None
+    data = mm[start:end]
+    if b'/FlateDecode' in dictionary:
+        try:
+            return zlib.decompressobj().decompress(data, PDF_HEAD_BYTES)
+        except zlib.error:
+            return None
+    if b'/Filter' in dictionary:
+        return None
+    return data
+
+def _read_catalog_metadata(mm, tail_start):
+    """
+    트레일러의 /Root(카탈로그)가 가리키는 문서 XMP 메타데이터 스트림을 반환합니다.
+    (카탈로그를 찾았는지 여부, 스트림 데이터 또는 None) 튜플을 반환합니다.
+    """
+    offset = _resolve_ref(mm, tail_start, _last_match(_ROOT_REF, mm, tail_start))
+    if offset is None:
+        return False, None
+    offset = _resolve_ref(mm, tail_start, _METADATA_REF.search(_object_body(mm, offset)))
+    if offset is None:
+        return True, None
+    return True, _read_stream(mm, offset)
+
+def extract_pdf_metadata_date(path):
+    """
+    트레일러가 가리키는 Info 딕셔너리와 카탈로그의 XMP 메타데이터에서 생성 날짜를 추출합니다.
+    문서 전체를 파싱하지 않고 파일을 메모리 매핑한 뒤 필요한 객체만 읽습니다.
+    카탈로그를 찾지 못한 경우(압축된 객체 스트림 등)에만 끝부분과 앞부분의 XMP 패킷을 검색하며,
+    이미지 객체에 들어 있는 패킷은 제외합니다.
+    """
+    empty = {'year': None, 'month': None, 'day': None}
+    try:
+        with open(path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            if size == 0:
+                return empty
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                tail_start = max(0, size - PDF_TAIL_BYTES)
+                info = _read_info_object(mm, tail_start)
+                if info:
+                    date_info = _search_pdf_date(info, _INFO_DATE_PATTERNS)
+                    if date_info:
+                        return date_info
+                
+                found_catalog, metadata = _read_catalog_metadata(mm, tail_start)
+                if found_catalog:
+                    packets = _find_xmp_packets(metadata) if metadata else []
+                else:
+                    packets = _find_xmp_packets(mm, tail_start, skip_images=True)
+                    if tail_start > 0:
+                        packets += _find_xmp_packets(mm, 0, min(PDF_HEAD_BYTES, tail_start), skip_images=True)
+                for packet in packets:
+                    date_info = _search_pdf_date(packet, _XMP_DATE_PATTERNS)
+                    if date_info:
+                        return date_info
+    except (OSError, ValueError) as e:
+        print(f"메타데이터 읽기 실패: {path} ({e})")
+    return empty
+
+def fill_dates_from_pdf_metadata(file_info_list, workers=None):
+    """
+    파일명과 디렉토리명으로 날짜를 알 수 없는 PDF만 골라
+    프로세스 풀에서 메타데이터 날짜를 읽어 채웁니다. 채운 파일 수를 반환합니다.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+    
+    undated = [info for info in file_info_list if not info['year']]
+    if not undated:
+        return 0
+    
+    print(f"\n날짜를 알 수 없는 {len(undated)}개 PDF 파일의 메타데이터를 확인합니다...")
+    start_time = time.time()
+    filled = 0
+    chunksize = max(1, len(undated) // ((workers or os.cpu_count() or 1) * 4))
+    
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        paths = [info['full_path'] for info in undated]
+        for info, date_info in zip(undated, executor.map(extract_pdf_metadata_date, paths, chunksize=chunksize)):
+            if not date_info['year']:
+                continue
+            info.update(date_info)
+            info['date'] = format_date(info['year'], info['month'], info['day'])
+            filled += 1
+    
+    elapsed = time.time() - start_time
+    print(f"메타데이터 확인 완료: {filled}/{len(undated)}개 파일의 날짜를 찾았습니다 (총 {elapsed:.1f}초)")
+    return filled
+
+def _raise_walk_error(error):
+    raise error
+
+def _walk_dirs(root_dir, subdirs=None, include_root_files=True, strict=False):
+    """
+    os.walk()와 같은 형식으로 (디렉토리 경로, 하위 디렉토리 목록, 파일 목록)을 반환합니다.
+    subdirs가 주어지면 root_dir 바로 아래의 해당 디렉토리들만 재귀적으로 탐색하고,
+    include_root_files가 참이면 root_dir 자체의 파일도 포함합니다.
+    strict가 참이면 읽을 수 없는 디렉토리를 건너뛰지 않고 OSError를 발생시킵니다.
+    """
+    onerror = _raise_walk_error if strict else None
+    if subdirs is None:
+        yield from os.walk(root_dir, onerror=onerror)
+        return
+    
+    if include_root_files:
+        try:
+            filenames = [entry.name for entry in os.scandir(root_dir) if not entry.is_dir()]
+        except OSError:
+            if strict:
+                raise
+            filenames = []
+        yield root_dir, [], filenames
+    
+    for subdir in subdirs:
+        yield from os.walk(os.path.join(root_dir, subdir), onerror=onerror)
+
+def find_pdf_files(root_dir, subdirs=None, include_root_files=True, strict=False):
     """
     PDF 파일만 탐색하고 정보를 수집하는 함수
+    subdirs를 지정하면 root_dir 아래의 일부 디렉토리만 탐색합니다 (샤드 단위 탐색).
+    strict가 참이면 경로가 없거나 읽을 수 없는 디렉토리가 있을 때 빈/부분 결과 대신 OSError를 발생시킵니다.
     """
     file_info_list = []
     
     if not os.path.exists(root_dir):
+        if strict:
+            raise FileNotFoundError(f"경로가 존재하지 않습니다: {root_dir}")
         print(f"경로가 존재하지 않습니다: {root_dir}")
         return file_info_list
     
@@ -113,7 +423,7 @@ def find_pdf_files(root_dir):
     print(f"'{root_dir}' 경로에서 PDF 파일을 검색합니다...")
     
     # os.walk()를 사용해 모든 디렉토리와 파일을 재귀적으로 탐색
-    for dirpath, dirnames, filenames in os.walk(root_dir):
+    for dirpath, dirnames, filenames in _walk_dirs(root_dir, subdirs, include_root_files, strict):
         processed_dirs += 1
         
         dir_name = os.path.basename(dirpath)
@@ -142,17 +452,7 @@ def find_pdf_files(root_dir):
                 'day': file_date_info['day'] or (dir_date_info['day'] if dir_date_info else None),
             }
             
-            try:
-                if file_info['year'] and file_info['month'] and file_info['day']:
-                    file_info['date'] = f"{file_info['year']}-{file_info['month']:02d}-{file_info['day']:02d}"
-                elif file_info['year'] and file_info['month']:
-                    file_info['date'] = f"{file_info['year']}-{file_info['month']:02d}"
-                elif file_info['year']:
-                    file_info['date'] = f"{file_info['year']}"
-                else:
-                    file_info['date'] = '알 수 없음'
-            except:
-                file_info['date'] = '알 수 없음'
+            file_info['date'] = format_date(file_info['year'], file_info['month'], file_info['day'])
             
             try:
                 mtime = os.path.getmtime(full_path)
@@ -172,62 +472,211 @@ def find_pdf_files(root_dir):
     
     return file_info_list
 
-def save_to_csv(file_info_list, output_file="pdf_files.csv"):
+def plan_shards(root_dirs, shards_per_root=1):
     """
-    파일 정보 목록을 CSV 파일로 저장합니다.
-    파일명, 연도, 월, 일을 별도 컬럼으로 저장 (월, 일은 두 자리 형식).
+    검색할 루트 디렉토리들을 샤드 목록으로 나눕니다.
+    shards_per_root가 2 이상이면 각 루트의 최상위 하위 디렉토리를 이름의 crc32 값에 따라
+    샤드에 배정하고, 루트 바로 아래의 파일은 첫 번째 샤드에 포함합니다.
+    샤드 id는 (루트, 샤드 수, 샤드 번호)로 정해지므로 디렉토리가 추가되어도 바뀌지 않고,
+    새 디렉토리는 해당 샤드 하나에만 배정됩니다.
     """
-    data = []
+    shards = []
+    seen = set()
+    for root_dir in root_dirs:
+        root_dir = os.path.abspath(root_dir)
+        if os.path.normcase(root_dir) in seen:
+            continue
+        seen.add(os.path.normcase(root_dir))
+        if not os.path.isdir(root_dir):
+            print(f"경로가 존재하지 않습니다: {root_dir}")
+            continue
+        
+        if shards_per_root <= 1:
+            groups = [None]
+        else:
+            groups = [[] for _ in range(shards_per_root)]
+            subdirs = sorted(entry.name for entry in os.scandir(root_dir) if entry.is_dir(follow_symlinks=False))
+            for name in subdirs:
+                groups[zlib.crc32(name.encode('utf-8', 'surrogateescape')) % shards_per_root].append(name)
+        
+        for i, group in enumerate(groups):
+            if i > 0 and not group:
+                continue
+            key = json.dumps([root_dir, max(shards_per_root, 1), i], ensure_ascii=False).encode('utf-8')
+            shards.append({
+                'id': hashlib.sha1(key).hexdigest()[:12],
+                'root': root_dir,
+                'subdirs': group,
+                'include_root_files': i == 0,
+            })
+    return shards
+
+def _partial_index_path(index_dir, shard):
+    return os.path.join(index_dir, f"shard-{shard['id']}.json")
+
+def scan_shard(shard, index_dir):
+    """
+    샤드 하나를 탐색하여 부분 인덱스 파일로 저장하고 파일 경로를 반환합니다.
+    임시 파일에 쓴 뒤 이름을 바꾸므로 부분 인덱스 파일이 있으면 해당 샤드는 완료된 것입니다.
+    루트가 없거나 읽을 수 없는 디렉토리가 있으면 부분 인덱스를 쓰지 않고 실패합니다.
+    """
+    file_info_list = find_pdf_files(shard['root'], shard['subdirs'], shard['include_root_files'], strict=True)
+    path = _partial_index_path(index_dir, shard)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({'shard': shard, 'files': file_info_list}, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+    return path
+
+def run_shards(shards, index_dir, workers=None, rescan=False):
+    """
+    샤드마다 별도 프로세스에서 탐색을 실행합니다.
+    이미 같은 범위의 부분 인덱스가 있는 샤드는 rescan이 아니면 건너뛰므로, 실패한 샤드만 다시 탐색할 수 있습니다.
+    (부분 인덱스 경로 목록, 실패한 샤드 목록)을 반환합니다.
+    """
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+    
+    os.makedirs(index_dir, exist_ok=True)
+    paths = []
+    pending = []
+    for shard in shards:
+        path = _partial_index_path(index_dir, shard)
+        if os.path.exists(path) and not rescan:
+            # 하위 디렉토리가 추가/삭제된 샤드는 다시 탐색
+            try:
+                with open(path, encoding='utf-8') as f:
+                    done = json.load(f)['shard']
+            except (OSError, ValueError, KeyError):
+                done = None
+            if done == shard:
+                print(f"샤드 {shard['id']} 건너뜀 (부분 인덱스 있음): {path}")
+                paths.append(path)
+                continue
+        pending.append(shard)
+    
+    failed = []
+    if pending:
+        print(f"{len(pending)}개 샤드를 탐색합니다 (전체 {len(shards)}개)...")
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(scan_shard, shard, index_dir): shard for shard in pending}
+            for future in as_completed(futures):
+                shard = futures[future]
+                try:
+                    paths.append(future.result())
+                except Exception as e:
+                    print(f"샤드 {shard['id']} 탐색 실패 ({shard['root']}): {e}")
+                    failed.append(shard)
+    return paths, failed
+
+def merge_partial_indexes(paths):
+    """
+    부분 인덱스 파일들을 합쳐 경로 기준으로 중복을 제거하고 정렬된 목록을 반환합니다.
+    """
+    merged = {}
+    for path in sorted(paths):
+        with open(path, encoding='utf-8') as f:
+            for info in json.load(f)['files']:
+                key = os.path.normcase(os.path.abspath(info['full_path']))
+                merged.setdefault(key, info)
+    return [merged[key] for key in sorted(merged)]
+
+EXPORT_COLUMNS = ['PDF 파일명', '연도', '월', '일']
+
+def _export_rows(file_info_list):
+    """
+    저장용 행 목록을 만듭니다. 파일명, 연도, 월, 일 (월, 일은 두 자리 형식).
+    """
+    rows = []
     for info in file_info_list:
         month_formatted = f"{info['month']:02d}" if info['month'] else ''
         day_formatted = f"{info['day']:02d}" if info['day'] else ''
-        
-        row = {
-            'PDF 파일명': info['filename'],
-            '연도': info['year'] if info['year'] else '',
-            '월': month_formatted,
-            '일': day_formatted
-        }
-        data.append(row)
-    
-    df = pd.DataFrame(data)
+        rows.append([
+            info['filename'],
+            info['year'] if info['year'] else '',
+            month_formatted,
+            day_formatted
+        ])
+    return rows
+
+def save_to_csv(file_info_list, output_file="pdf_files.csv"):
+    """
+    파일 정보 목록을 CSV 파일로 저장합니다.
+    파일명, 연도, 월, 일을 별도 컬럼으로 저장 (월, 일은 두 자리 형식).
+    """
+    import csv
     
-    df.to_csv(output_file, index=False, encoding='utf-8-sig')
+    with open(output_file, 'w', newline='', encoding='utf-8-sig') as f:
+        writer = csv.writer(f)
+        writer.writerow(EXPORT_COLUMNS)
+        writer.writerows(_export_rows(file_info_list))
     
     print(f"PDF 파일 목록이 '{output_file}' CSV 파일로 저장되었습니다.")
 
+# XML 1.0에서 허용되지 않는 제어 문자
+_XML_ILLEGAL_CHARS = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+def _xlsx_cell(ref, value):
+    from xml.sax.saxutils import escape
+    
+    if isinstance(value, int):
+        return f'<c r="{ref}"><v>{value}</v></c>'
+    text = escape(_XML_ILLEGAL_CHARS.sub('', str(value)))
+    return f'<c r="{ref}" t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>'
+
+def _write_xlsx(output_file, sheet_name, header, rows):
+    """
+    외부 라이브러리 없이 시트 하나짜리 최소 구성 xlsx 파일을 작성합니다.
+    """
+    import zipfile
+    from xml.sax.saxutils import quoteattr
+    
+    columns = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+    sheet_rows = []
+    for row_index, row in enumerate([header] + rows, start=1):
+        cells = ''.join(_xlsx_cell(f"{columns[col]}{row_index}", value) for col, value in enumerate(row))
+        sheet_rows.append(f'<row r="{row_index}">{cells}</row>')
+    
+    sheet = ('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+             '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+             '<sheetData>' + ''.join(sheet_rows) + '</sheetData></worksheet>')
+    workbook = ('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+                '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+                'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+                f'<sheets><sheet name={quoteattr(sheet_name)} sheetId="1" r:id="rId1"/></sheets></workbook>')
+    workbook_rels = ('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+                     '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+                     '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+                     'Target="worksheets/sheet1.xml"/></Relationships>')
+    root_rels = ('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+                 '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+                 '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+                 'Target="xl/workbook.xml"/></Relationships>')
+    content_types = ('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+                     '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+                     '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+                     '<Default Extension="xml" ContentType="application/xml"/>'
+                     '<Override PartName="/xl/workbook.xml" '
+                     'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+                     '<Override PartName="/xl/worksheets/sheet1.xml" '
+                     'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+                     '</Types>')
+    
+    with zipfile.ZipFile(output_file, 'w', zipfile.ZIP_DEFLATED) as xlsx:
+        xlsx.writestr('[Content_Types].xml', content_types)
+        xlsx.writestr('_rels/.rels', root_rels)
+        xlsx.writestr('xl/workbook.xml', workbook)
+        xlsx.writestr('xl/_rels/workbook.xml.rels', workbook_rels)
+        xlsx.writestr('xl/worksheets/sheet1.xml', sheet)
+
 def save_to_excel(file_info_list, output_file="pdf_files.xlsx"):
     """
     파일 정보 목록을 엑셀 파일로 저장합니다.
     파일명, 연도, 월, 일을 별도 컬럼으로 저장.
     """
     try:
-        data = []
-        for info in file_info_list:
-            month_formatted = f"{info['month']:02d}" if info['month'] else ''
-            day_formatted = f"{info['day']:02d}" if info['day'] else ''
-            
-            row = {
-                'PDF 파일명': info['filename'],
-                '연도': info['year'] if info['year'] else '',
-                '월': month_formatted,
-                '일': day_formatted
-            }
-            data.append(row)
-        
-        df = pd.DataFrame(data)
-        
-        try:
-            with pd.ExcelWriter(output_file, engine='openpyxl') as writer:
-                df.to_excel(writer, sheet_name='PDF 파일 정보', index=False)
-            print(f"PDF 파일 목록이 '{output_file}' 엑셀 파일로 저장되었습니다.")
-            return True
-        except ImportError:
-            print("openpyxl 모듈이 설치되어 있지 않아 CSV 파일로 저장합니다.")
-
-            csv_file = os.path.splitext(output_file)[0] + '.csv'
-            save_to_csv(file_info_list, csv_file)
-            return False
+        _write_xlsx(output_file, 'PDF 파일 정보', EXPORT_COLUMNS, _export_rows(file_info_list))
+        print(f"PDF 파일 목록이 '{output_file}' 엑셀 파일로 저장되었습니다.")
+        return True
     except Exception as e:
         print(f"파일 저장 중 오류 발생: {e}")
         print("CSV 파일로 저장을 시도합니다.")
@@ -241,24 +690,72 @@ def main():
     """
     # 명령줄 인수 처리
     if len(sys.argv) < 2:
-        print("사용법: python script.py <검색할_디렉토리> [--output <출력_파일명>]")
+        print("사용법: python script.py <검색할_디렉토리> [<검색할_디렉토리> ...] [--output <출력_파일명>] "
+              "[--pdf-metadata] [--workers <프로세스_수>] [--shards <루트별_샤드_수>] [--index-dir <부분_인덱스_디렉토리>] [--rescan]")
         return
         
-    root_dir = sys.argv[1]
+    root_dirs = []
     output_file = "pdf_files.xlsx"
+    use_metadata = False
+    workers = None
+    shards_per_root = 1
+    index_dir = None
+    rescan = False
     
-    for i in range(2, len(sys.argv)):
-        if sys.argv[i] == "--output" and i + 1 < len(sys.argv):
-            output_file = sys.argv[i + 1]
-            break
+    i = 1
+    while i < len(sys.argv):
+        arg = sys.argv[i]
+        if arg in ("--output", "--workers", "--shards", "--index-dir") and i + 1 < len(sys.argv):
+            value = sys.argv[i + 1]
+            if arg == "--output":
+                output_file = value
+            elif arg == "--workers":
+                workers = int(value)
+            elif arg == "--shards":
+                shards_per_root = int(value)
+            else:
+                index_dir = value
+            i += 2
+            continue
+        if arg == "--pdf-metadata":
+            use_metadata = True
+        elif arg == "--rescan":
+            rescan = True
+        else:
+            root_dirs.append(arg)
+        i += 1
+    
+    if not root_dirs:
+        print("검색할 디렉토리를 지정해야 합니다.")
+        return
     
     if not (output_file.lower().endswith('.xlsx') or output_file.lower().endswith('.csv')):
         output_file += '.xlsx'
     
-    pdf_files = find_pdf_files(root_dir)
+    if len(root_dirs) == 1 and shards_per_root <= 1 and index_dir is None:
+        pdf_files = find_pdf_files(root_dirs[0])
+    else:
+        # 루트/샤드별로 별도 프로세스에서 탐색한 뒤 부분 인덱스를 병합
+        if index_dir is None:
+            index_dir = os.path.splitext(output_file)[0] + '.index'
+        shards = plan_shards(root_dirs, shards_per_root)
+        paths, failed = run_shards(shards, index_dir, workers, rescan)
+        pdf_files = merge_partial_indexes(paths)
+        print(f"\n병합 완료: {len(paths)}개 부분 인덱스에서 {len(pdf_files)}개 PDF 파일 (중복 제거)")
+        if failed:
+            print(f"경고: {len(failed)}개 샤드가 실패하여 목록이 불완전합니다. "
+                  f"같은 명령을 다시 실행하면 실패한 샤드만 다시 탐색합니다.")
+    
+    # 파일명으로 날짜를 알 수 없는 파일은 PDF 메타데이터에서 날짜 확인
+    if pdf_files and use_metadata:
+        fill_dates_from_pdf_metadata(pdf_files, workers)
     
     if pdf_files:
-        success = save_to_excel(pdf_files, output_file)
+        if output_file.lower().endswith('.csv'):
+            save_to_csv(pdf_files, output_file)
+            success = False
+        else:
+            success = save_to_excel(pdf_files, output_file)
         
         if success:
             print(f"\n엑셀 파일에 PDF 파일명, 연도, 월, 일 정보가 포함된 시트가 생성되었습니다.")
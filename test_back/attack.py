@@ -9,7 +9,9 @@ from datetime import datetime
 from pydantic import BaseModel
 from typing import Dict, Any, Optional, List
 import jsonify
-import requests
+import time
+from metrics import init_fastapi_metrics
+from routing import Router
 
 # 로깅 설정
 logging.basicConfig(
@@ -25,6 +27,9 @@ logger = logging.getLogger("LogReceiver")
 # FastAPI 앱 생성
 app = FastAPI(title="Log Receiver API", description="외부 서버로부터 로그를 수신하는 API")
 
+# 라우트별 요청 수/지연 시간 및 업스트림 전달 시간 계측 (/metrics, /debug/profile)
+metrics = init_fastapi_metrics(app)
+
 # 설정 변수
 HOST = os.environ.get("HOST", "0.0.0.0")
 PORT = int(os.environ.get("PORT", 8080))
@@ -32,6 +37,21 @@ LOG_FILE = os.environ.get("LOG_FILE", "detailed_logs.json")
 FORWARD_TARGET_URL = os.environ.get("FORWARD_URL", "http://localhost:8081/api/log")
 FORWARD_ENABLED = os.environ.get("FORWARD_ENABLED", "true").lower() in ("true", "1", "yes", "y")
 FORWARD_TIMEOUT = int(os.environ.get("FORWARD_TIMEOUT", "5"))  # 초 단위
+ROUTES_FILE = os.environ.get("ROUTES_FILE")  # 전달 대상 라우팅 테이블 (JSON, 변경 시 자동 재적용)
+
+# 전달 시 그대로 넘기지 않는 헤더 (연결 관련 헤더와 대상에 맞게 다시 계산되는 값)
+HOP_BY_HOP_HEADERS = {"host", "content-length", "connection", "keep-alive", "transfer-encoding", "upgrade"}
+
+# source/Host별 업스트림 풀 (ROUTES_FILE이 없으면 FORWARD_URL의 서버를 기본 대상으로 사용)
+router = Router(ROUTES_FILE, default_url=FORWARD_TARGET_URL)
+
+@app.on_event("startup")
+async def start_router():
+    await router.start()
+
+@app.on_event("shutdown")
+async def close_router():
+    await router.close()
 
 # 로그 저장 함수
 def save_log_to_file(log_data):
@@ -91,48 +111,68 @@ async def receive_log(request: Request):
             request_body = data.get("body")
             request_headers = data.get("headers", {})
             host_value = request_headers.get("Host") or request_headers.get("host")
-            if not host_value:
-                host_value = "127.0.0.1"
-            print(f"추출된 Host 헤더: {host_value}")
-            # 대상 URL 구성
-            target_url = f"http://{host_value}{target_path}"
+            
+            if method not in ("GET", "POST", "PUT", "DELETE", "PATCH"):
+                raise HTTPException(status_code=400, detail=f"지원하지 않는 HTTP 메서드: {method}")
+            if not isinstance(target_path, str) or not target_path.startswith("/") or target_path.startswith("//"):
+                raise HTTPException(status_code=400, detail="path는 '/'로 시작하는 경로여야 합니다")
+            if not FORWARD_ENABLED:
+                return {"status": "success", "message": "전달 비활성화 상태"}
+            
+            # 라우팅 테이블에 등록된 업스트림으로만 전달 (Host 헤더로 임의 대상 지정 불가)
+            pool, upstream = router.resolve(data.get("source"), host_value)
+            if upstream is None:
+                raise HTTPException(status_code=403, detail=f"라우팅 대상이 없습니다: source={data.get('source')}, host={host_value}")
+            target_url = f"{upstream}{target_path}"
+            forward_headers = {key: value for key, value in request_headers.items() if key.lower() not in HOP_BY_HOP_HEADERS}
             
             print(f"\n===== 전달 정보 =====")
-            print(f"대상 URL: {target_url}")
+            print(f"대상 URL: {target_url} (풀: {pool.name})")
             print(f"메서드: {method}")
-            print(f"헤더: {request_headers}")
+            print(f"헤더: {forward_headers}")
             print(f"본문: {request_body}")
             
-            # HTTP 메서드에 따라 요청 전달
-            response = None
-            
-            if method == "GET":
-                response = requests.get(target_url, headers=request_headers)
-            elif method == "POST":
-                response = requests.post(target_url, json=request_body, headers=request_headers)
-            elif method == "PUT":
-                response = requests.put(target_url, json=request_body, headers=request_headers)
-            elif method == "DELETE":
-                response = requests.delete(target_url, headers=request_headers)
-            elif method == "PATCH":
-                response = requests.patch(target_url, json=request_body, headers=request_headers)
-            else:
-                raise HTTPException(status_code=400, detail=f"지원하지 않는 HTTP 메서드: {method}")
+            # 업스트림별 keep-alive 연결 풀을 통해 비동기로 전달
+            upstream_start = time.perf_counter()
+            upstream_error = True
+            try:
+                async with router.session.request(
+                    method,
+                    target_url,
+                    json=request_body if method in ("POST", "PUT", "PATCH") else None,
+                    headers=forward_headers,
+                    timeout=aiohttp.ClientTimeout(total=FORWARD_TIMEOUT),
+                ) as response:
+                    response_status = response.status
+                    response_text = (await response.text(errors="ignore"))[:200]
+                upstream_error = response_status >= 500
+            except asyncio.TimeoutError:
+                # aiohttp.ServerTimeoutError도 여기서 처리 (ClientError이면서 TimeoutError)
+                pool.mark_failed(upstream)
+                raise HTTPException(status_code=504, detail=f"업스트림 응답 시간 초과: {upstream}")
+            except aiohttp.ClientError as e:
+                pool.mark_failed(upstream)
+                raise HTTPException(status_code=502, detail=f"업스트림 연결 실패: {upstream} ({e})")
+            finally:
+                metrics.observe_upstream(upstream, time.perf_counter() - upstream_start, error=upstream_error)
+            pool.mark_ok(upstream)
             
             print("\n===== 전달 결과 =====")
-            print(f"상태 코드: {response.status_code}")
-            print(f"응답: {response.text[:200]}")
+            print(f"상태 코드: {response_status}")
+            print(f"응답: {response_text}")
             
             return {
                 "status": "success", 
                 "message": "요청 전달 완료",
-                "response_status": response.status_code,
-                "response_text": response.text[:200]
+                "response_status": response_status,
+                "response_text": response_text
             }
             
         except json.JSONDecodeError:
             raise HTTPException(status_code=400, detail="JSON 파싱 실패")
             
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"오류 발생: {e}")
         # FastAPI에서는 jsonify를 사용하지 않고 dict를 반환
@@ -141,7 +181,7 @@ async def receive_log(request: Request):
 def main():
     """API 서버 시작"""
     logger.info(f"Log Receiver API 시작 중: {HOST}:{PORT}")
-    uvicorn.run(app, host=HOST, port=8080)
+    uvicorn.run(app, host=HOST, port=PORT)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,215 @@
+from collections import OrderedDict
+from urllib.parse import unquote_plus
+import copy
+import hashlib
+import re
+import threading
+
+# 페이로드 형태를 만들 때 그대로 남겨 두는 SQL 키워드
+SQL_KEYWORDS = {
+    "select", "union", "all", "from", "where", "and", "or", "not", "null", "insert", "into",
+    "update", "delete", "drop", "table", "values", "set", "order", "by", "group", "having",
+    "sleep", "benchmark", "exec", "script", "alert", "onerror", "src", "img", "javascript",
+}
+MAX_SHAPE_LENGTH = 256
+MAX_PATH_LENGTH = 512  # 지문 계산과 집계 항목에 사용하는 경로 길이
+# 샘플 하나의 크기 상한: 아래 필드만 보관하고 문자열은 필드별 길이로 자름
+# (헤더는 SAMPLE_HEADERS만, 값마다 MAX_SAMPLE_HEADER자)
+MAX_SAMPLE_FIELD = 4096
+MAX_SAMPLE_HEADER = 512
+SAMPLE_FIELDS = ("timestamp", "method", "path", "ip", "headers", "body", "query", "is_attack", "attack_type", "curl_command")
+SAMPLE_HEADERS = ("Host", "User-Agent", "Content-Type", "Referer")
+
+_TOKEN_PATTERN = re.compile(r"[a-z_]+|\d+|\s+")
+
+
+def _shape_token(match):
+    token = match.group(0)
+    if token.isspace():
+        return " "
+    if token.isdigit():
+        return "0"
+    return token if token in SQL_KEYWORDS else "a"
+
+
+def payload_shape(text):
+    """
+    페이로드에서 값은 지우고 구조만 남깁니다.
+    예) "admin' OR 1=1--" 와 "root' or 2=2--" 는 모두 "a' or 0=0--" 가 됩니다.
+    """
+    if not text:
+        return ""
+    text = unquote_plus(text).lower()[:4096]
+    return _TOKEN_PATTERN.sub(_shape_token, text)[:MAX_SHAPE_LENGTH]
+
+
+def _form_shape(text):
+    # key=value&... 형식이면 키 이름은 그대로 두고 값의 형태만 남김
+    if text and "=" in text and not text.lstrip().startswith(("{", "[")):
+        pairs = []
+        for pair in text.split("&"):
+            key, _, value = pair.partition("=")
+            pairs.append(f"{unquote_plus(key)}={payload_shape(value)}")
+        return "&".join(pairs)[:MAX_SHAPE_LENGTH]
+    return payload_shape(text)
+
+
+def fingerprint(log_data):
+    """공격 유형, 메서드, 경로, 페이로드 형태로 (지문, 형태 문자열)을 계산"""
+    shape = f"q:{_form_shape(log_data.get('query'))} b:{_form_shape(log_data.get('body'))}"
+    key = "|".join([
+        ",".join(sorted(log_data.get("attack_type") or [])),
+        log_data.get("method") or "",
+        (log_data.get("path") or "")[:MAX_PATH_LENGTH],
+        shape,
+    ])
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()[:16], shape
+
+
+def _truncate(value, limit):
+    if isinstance(value, str) and len(value) > limit:
+        return value[:limit] + f"... ({len(value)}자 중 {limit}자)"
+    return value
+
+
+def _trim_sample(log_data):
+    """
+    샘플 보관용 사본. SAMPLE_FIELDS와 SAMPLE_HEADERS만 남기고 긴 값은 잘라내므로
+    요청 크기와 관계없이 샘플 하나가 약 16KB를 넘지 않습니다.
+    """
+    sample = {}
+    for field in SAMPLE_FIELDS:
+        if field not in log_data:
+            continue
+        value = log_data[field]
+        if field == "headers":
+            headers = {str(key).lower(): val for key, val in (value or {}).items()}
+            value = {
+                name: _truncate(str(headers[name.lower()]), MAX_SAMPLE_HEADER)
+                for name in SAMPLE_HEADERS if name.lower() in headers
+            }
+        elif field == "path":
+            value = _truncate(value, MAX_PATH_LENGTH)
+        elif field == "attack_type":
+            value = [_truncate(str(item), MAX_SAMPLE_HEADER) for item in (value or [])[:10]]
+        elif field in ("timestamp", "method", "ip"):
+            value = _truncate(value, MAX_SAMPLE_HEADER)
+        else:
+            value = _truncate(value, MAX_SAMPLE_FIELD)
+        sample[field] = value
+    return sample
+
+
+def attack_event(log_data):
+    """
+    집계기에 보낼 공격 이벤트. 지문 계산과 샘플 정리는 요청을 받은 워커에서 하고
+    집계 서버에는 크기가 제한된 이 사전만 전달합니다.
+    """
+    fp, shape = fingerprint(log_data)
+    return {
+        "fingerprint": fp,
+        "shape": shape,
+        "attack_type": list(log_data.get("attack_type") or []),
+        "method": _truncate(log_data.get("method"), MAX_SAMPLE_HEADER),
+        "path": (log_data.get("path") or "")[:MAX_PATH_LENGTH],
+        "timestamp": log_data.get("timestamp"),
+        "ip": _truncate(log_data.get("ip") or "unknown", MAX_SAMPLE_HEADER),
+        "sample": _trim_sample(log_data),
+    }
+
+
+class AttackAggregator:
+    """
+    공격 요청을 지문별로 묶어 횟수, 최초/최근 시각, IP별 횟수와 일부 샘플만 보관합니다.
+    지문 수와 지문별 IP/샘플 수가 모두 제한되어 있어 대량 공격에도 메모리 사용량이 일정합니다.
+    지문 수가 한도를 넘으면 가장 오래 전에 관측된 지문부터 제거합니다.
+    """
+
+    def __init__(self, max_fingerprints=200, max_samples=3, max_ips=20):
+        self.max_fingerprints = max_fingerprints
+        self.max_samples = max_samples
+        self.max_ips = max_ips
+        self._entries = OrderedDict()
+        self._total = 0
+        self._evicted_fingerprints = 0
+        self._evicted_requests = 0
+        self._lock = threading.Lock()
+
+    def record(self, log_data):
+        """공격 로그 한 건을 반영하고 (지문, 새 지문 여부)를 반환"""
+        event = attack_event(log_data)
+        with self._lock:
+            is_new = self._add(event)
+        return event["fingerprint"], is_new
+
+    def add(self, events):
+        """워커에서 모아 보낸 attack_event() 목록을 반영"""
+        with self._lock:
+            for event in events:
+                self._add(event)
+
+    def _add(self, event):
+        fp = event["fingerprint"]
+        timestamp = event["timestamp"]
+        ip = event["ip"]
+
+        self._total += 1
+        entry = self._entries.get(fp)
+        is_new = entry is None
+        if is_new:
+            entry = {
+                "fingerprint": fp,
+                "attack_type": event["attack_type"],
+                "method": event["method"],
+                "path": event["path"],
+                "shape": event["shape"],
+                "count": 0,
+                "first_seen": timestamp,
+                "last_seen": timestamp,
+                "ips": {},
+                "other_ips": 0,
+                "samples": [],
+            }
+            self._entries[fp] = entry
+            while len(self._entries) > self.max_fingerprints:
+                _, evicted = self._entries.popitem(last=False)
+                self._evicted_fingerprints += 1
+                self._evicted_requests += evicted["count"]
+        else:
+            self._entries.move_to_end(fp)
+
+        entry["count"] += 1
+        entry["last_seen"] = timestamp
+
+        ips = entry["ips"]
+        if ip in ips or len(ips) < self.max_ips:
+            ips[ip] = ips.get(ip, 0) + 1
+        else:
+            entry["other_ips"] += 1
+
+        entry["samples"].append(event["sample"])
+        if len(entry["samples"]) > self.max_samples:
+            del entry["samples"][0]
+        return is_new
+
+    def snapshot(self):
+        """대시보드용 요약 (지문은 요청 횟수가 많은 순서)"""
+        with self._lock:
+            entries = copy.deepcopy(list(self._entries.values()))
+            summary = {
+                "total": self._total,
+                "evicted_fingerprints": self._evicted_fingerprints,
+                "evicted_requests": self._evicted_requests,
+            }
+        entries.sort(key=lambda entry: entry["count"], reverse=True)
+        for entry in entries:
+            entry["ips"] = sorted(entry["ips"].items(), key=lambda item: item[1], reverse=True)
+        summary["fingerprints"] = entries
+        return summary
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._total = 0
+            self._evicted_fingerprints = 0
+            self._evicted_requests = 0
@@ -5,6 +5,10 @@ import traceback
 import time
 import json
 from datetime import datetime
+from rate_limiter import init_rate_limiter
+from metrics import init_metrics
+from response_cache import CachedPage
+from log_aggregator import AttackStore, LogBuffer
 
 # 로깅 설정 (개발 서버는 상세 로깅)
 logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - [DEV] %(levelname)s - %(message)s')
@@ -13,9 +17,17 @@ logger = logging.getLogger(__name__)
 app = Flask(__name__)
 app.debug = True  # 디버그 모드 활성화
 
-# 요청 로그를 저장할 리스트
-request_logs = []
-attack_logs = []
+# IP별 요청 제한 (공격 탐지 시 해당 IP의 한도를 강화)
+rate_limiter = init_rate_limiter(app)
+
+# 라우트별 요청 수/지연 시간 계측 (/metrics, /debug/profile)
+metrics = init_metrics(app)
+
+# 요청 로그를 저장할 버퍼 (최근 100개만 유지)
+# 공격 로그는 지문(공격 유형, 경로, 페이로드 형태)별로 집계하여 최대 200개 지문만 유지
+# serve.py로 여러 워커를 띄우면 모든 워커가 같은 저장소를 공유
+request_logs = LogBuffer("request_logs", 100)
+attack_logs = AttackStore("attack_logs", 200)
 
 
 from flask import request
@@ -90,15 +102,14 @@ def log_request_info():
     # 공격 로그 저장
     request_logs.append(log_data)
     if is_attack:
-        attack_logs.append(log_data)
-        logger.warning(f"공격 의심: {attack_type} - {request.path}")
-        logger.warning(f"공격 curl 명령어: {log_data['curl_command']}")
-
-    # 로그 크기 제한 (최근 100개만 유지)
-    if len(request_logs) > 100:
-        request_logs.pop(0)
-    if len(attack_logs) > 50:
-        attack_logs.pop(0)
+        fingerprint, is_new = attack_logs.record(log_data)
+        rate_limiter.flag(request.remote_addr)
+        # 같은 형태의 공격이 반복되면 로그가 넘치지 않도록 (워커별로) 처음 관측된 경우만 경고
+        if is_new:
+            logger.warning(f"공격 의심: {attack_type} - {request.path} (지문 {fingerprint})")
+            logger.warning(f"공격 curl 명령어: {log_data['curl_command']}")
+        else:
+            logger.debug(f"반복 공격: 지문 {fingerprint} - {request.remote_addr}")
 
 # 오류 핸들러
 @app.errorhandler(Exception)
@@ -107,10 +118,8 @@ def handle_exception(e):
     logger.error(traceback.format_exc())
     return jsonify({"error": str(e), "trace": traceback.format_exc()}), 500
 
-# 메인 페이지
-@app.route('/')
-def index():
-    return render_template_string("""
+# 메인 페이지 (시작 시 한 번만 렌더링)
+INDEX_PAGE = CachedPage.from_template(app, """
     <html>
     <head>
         <title>개발 서버 (디버깅)</title>
@@ -139,6 +148,10 @@ def index():
     </html>
     """)
 
+@app.route('/')
+def index():
+    return INDEX_PAGE.respond(request)
+
 # 취약한 로그인 엔드포인트 (운영 서버와 동일하지만 로깅 강화)
 @app.route('/login', methods=['POST'])
 def login():
@@ -166,6 +179,9 @@ def login():
         }
     })
 
+# 댓글 목록 페이지 (시작 시 한 번만 렌더링)
+COMMENTS_PAGE = CachedPage.from_template(app, "<h1>댓글</h1><form method='post'><input name='comment'><button>추가</button></form>")
+
 # XSS 취약점이 있는 댓글 시스템 (운영 서버와 동일하게 취약)
 @app.route('/comments', methods=['GET', 'POST'])
 def comments():
@@ -183,12 +199,10 @@ def comments():
         return render_template_string("<p>댓글이 추가되었습니다: " + comment + "</p>")
     
     # 댓글 목록
-    return render_template_string("<h1>댓글</h1><form method='post'><input name='comment'><button>추가</button></form>")
+    return COMMENTS_PAGE.respond(request)
 
-# 로그 대시보드 페이지 (모든 요청 로그 표시)
-@app.route('/logs')
-def view_logs():
-    return render_template_string("""
+# 로그 대시보드 템플릿 (시작 시 한 번만 컴파일)
+LOGS_TEMPLATE = app.jinja_env.from_string("""
     <html>
     <head>
         <title>요청 로그 대시보드</title>
@@ -264,15 +278,28 @@ def view_logs():
         </table>
     </body>
     </html>
-    """, logs=request_logs, enumerate=enumerate, json=json)
+    """)
 
-# 공격 로그만 표시하는 페이지
-@app.route('/attack-logs')
-def view_attack_logs():
-    return render_template_string("""
+# 로그 대시보드 페이지 (모든 요청 로그 표시)
+@app.route('/logs')
+def view_logs():
+    return LOGS_TEMPLATE.render(logs=request_logs.snapshot(), enumerate=enumerate, json=json)
+
+# 공격 로그 템플릿 (시작 시 한 번만 컴파일)
+ATTACK_LOGS_TEMPLATE = app.jinja_env.from_string("""
     <html>
     <head>
         <title>공격 의심 로그</title>
+        <style>
+            .details { display: none; white-space: pre-wrap; font-family: monospace; }
+            .details-btn { cursor: pointer; color: blue; text-decoration: underline; }
+        </style>
+        <script>
+            function toggleDetails(id) {
+                var details = document.getElementById('details-' + id);
+                details.style.display = details.style.display === 'block' ? 'none' : 'block';
+            }
+        </script>
     </head>
     <body>
         <h1>공격 의심 로그</h1>
@@ -280,36 +307,48 @@ def view_attack_logs():
             <a href="/">홈</a>
             <a href="/logs">모든 로그 보기</a>
         </div>
+        <p>
+            전체 공격 요청 {{ summary.total }}건, 공격 지문 {{ summary.fingerprints|length }}개
+            {% if summary.evicted_fingerprints %}
+                (오래된 지문 {{ summary.evicted_fingerprints }}개 / {{ summary.evicted_requests }}건 정리됨)
+            {% endif %}
+        </p>
         
-        {% if logs %}
+        {% if summary.fingerprints %}
             <table>
     <tr>
-        <th>시간</th>
+        <th>횟수</th>
         <th>공격 유형</th>
         <th>메소드</th>
         <th>경로</th>
-        <th>IP</th>
-        <th>상세</th>
-        <th>Curl 명령어</th>
+        <th>페이로드 형태</th>
+        <th>최초 / 최근</th>
+        <th>IP (횟수)</th>
+        <th>샘플</th>
     </tr>
-   {% for i, log in enumerate(logs | reverse) %}
+   {% for entry in summary.fingerprints %}
         <tr>
-            <td>{{ log.get('timestamp') }}</td>
-            <td><strong>{{ ', '.join(log.get('attack_type', [])) }}</strong></td>
-            <td>{{ log.get('method') }}</td>
-            <td>{{ log.get('path') }}</td>
-            <td>{{ log.get('ip') }}</td>
+            <td>{{ entry.count }}</td>
+            <td><strong>{{ ', '.join(entry.attack_type) }}</strong></td>
+            <td>{{ entry.method }}</td>
+            <td>{{ entry.path }}</td>
+            <td><code>{{ entry.shape }}</code></td>
+            <td>{{ entry.first_seen }}<br>{{ entry.last_seen }}</td>
             <td>
-                <span class="details-btn" onclick="toggleDetails({{ i }})">상세 보기</span>
+                {% for ip, count in entry.ips[:5] %}{{ ip }} ({{ count }})<br>{% endfor %}
+                {% if entry.ips|length > 5 %}외 {{ entry.ips|length - 5 }}개 IP<br>{% endif %}
+                {% if entry.other_ips %}기타 IP {{ entry.other_ips }}건{% endif %}
             </td>
             <td>
-                <code>{{ log.get('curl_command', 'N/A') }}</code>
+                <span class="details-btn" onclick="toggleDetails('{{ entry.fingerprint }}')">샘플 {{ entry.samples|length }}개</span>
             </td>
         </tr>
         <tr>
-            <td colspan="7">
-                <div id="details-{{ i }}" class="details">
-                    {{ json.dumps(log, indent=2) }}
+            <td colspan="8">
+                <div id="details-{{ entry.fingerprint }}" class="details">
+                    {% for sample in entry.samples|reverse %}<code>{{ sample.get('curl_command', 'N/A') }}</code>
+{{ json.dumps(sample, indent=2) }}
+{% endfor %}
                 </div>
             </td>
         </tr>
@@ -321,9 +360,18 @@ def view_attack_logs():
         {% endif %}
     </body>
     </html>
-   """, logs=list(reversed(attack_logs)), enumerate=enumerate, json=json)
+   """)
 
+# 공격 로그를 지문별로 집계하여 표시하는 페이지
+@app.route('/attack-logs')
+def view_attack_logs():
+    return ATTACK_LOGS_TEMPLATE.render(summary=attack_logs.snapshot(), json=json)
 
 if __name__ == '__main__':
     port = int(os.environ.get('PORT', 8081))
-    app.run(host='0.0.0.0', port=port)
\ No newline at end of file
+    workers = int(os.environ.get('WORKERS', 1))
+    if workers > 1:
+        from serve import serve
+        serve(app, port=port, workers=workers)
+    else:
+        app.run(host='0.0.0.0', port=port)
\ No newline at end of file
@@ -0,0 +1,238 @@
+from collections import OrderedDict, deque
+from multiprocessing.managers import BaseManager
+import logging
+import os
+import secrets
+import tempfile
+import threading
+import time
+
+from attack_store import AttackAggregator, attack_event
+
+logger = logging.getLogger("log_aggregator")
+
+# 워커 프로세스가 접속할 집계 서버 주소(유닉스 소켓 경로)와 인증키 (serve.py가 설정)
+ADDR_ENV = "LOG_AGGREGATOR_ADDR"
+KEY_ENV = "LOG_AGGREGATOR_KEY"
+FLUSH_INTERVAL = 0.2  # 요청/공격 로그를 모아서 집계 서버로 보내는 주기 (초)
+
+
+class RingBuffer:
+    """최근 maxlen개의 로그만 유지하는 스레드 안전 버퍼"""
+
+    def __init__(self, maxlen):
+        self._items = deque(maxlen=maxlen)
+        self._lock = threading.Lock()
+
+    def append(self, item):
+        with self._lock:
+            self._items.append(item)
+
+    def extend(self, items):
+        with self._lock:
+            self._items.extend(items)
+
+    def snapshot(self):
+        """오래된 순서의 로그 목록 복사본 반환"""
+        with self._lock:
+            return list(self._items)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+
+# 집계 서버 프로세스 안에서만 사용되는 저장소
+_shared_objects = {}
+_shared_lock = threading.Lock()
+
+
+def _get_shared(name, factory, *args):
+    with _shared_lock:
+        if name not in _shared_objects:
+            _shared_objects[name] = factory(*args)
+        return _shared_objects[name]
+
+
+def _get_buffer(name, maxlen):
+    return _get_shared(name, RingBuffer, maxlen)
+
+
+def _get_attack_store(name, max_fingerprints):
+    return _get_shared(name, AttackAggregator, max_fingerprints)
+
+
+class LogAggregatorManager(BaseManager):
+    """워커들이 로컬 소켓으로 접속하는 로그 집계 서버"""
+
+
+LogAggregatorManager.register("get_buffer", callable=_get_buffer, exposed=("append", "extend", "snapshot", "clear"))
+LogAggregatorManager.register("get_attack_store", callable=_get_attack_store, exposed=("record", "add", "snapshot", "clear"))
+
+
+def start_aggregator():
+    """
+    로그 집계 서버를 별도 프로세스로 시작하고 접속 정보를 환경 변수에 기록합니다.
+    이후 fork되는 워커는 환경 변수를 상속받아 같은 집계 서버에 접속합니다.
+    (serve.py는 fork가 가능한 환경에서만 호출하므로 유닉스 소켓만 사용합니다)
+    """
+    authkey = secrets.token_bytes(16)
+    address = os.path.join(tempfile.mkdtemp(prefix="log-aggregator-"), "sock")
+    manager = LogAggregatorManager(address=address, authkey=authkey)
+    manager.start()
+
+    os.environ[ADDR_ENV] = manager.address
+    os.environ[KEY_ENV] = authkey.hex()
+    return manager
+
+
+def _connect():
+    manager = LogAggregatorManager(address=os.environ[ADDR_ENV], authkey=bytes.fromhex(os.environ[KEY_ENV]))
+    manager.connect()
+    return manager
+
+
+class _SharedObject:
+    """
+    집계 서버가 설정되어 있으면 모든 워커가 공유하는 객체에, 아니면 현재 프로세스의 객체에 연결합니다.
+    실제 연결은 처음 사용할 때 만들어지며 fork 이후에는 프로세스별로 다시 연결합니다.
+    집계 서버에 접속할 수 없게 되면 이 프로세스의 로컬 객체로 전환하여 요청 처리는 계속됩니다.
+    local_factory(*args)는 로컬 객체를, 집계 서버의 manager_method(name, *args)는 공유 객체를 만듭니다.
+
+    요청 처리 중에 추가하는 항목은 프로세스 내부 큐(최대 max_pending개)에만 넣고, 백그라운드 스레드가
+    FLUSH_INTERVAL마다 모아서 batch_method 한 번의 호출로 집계 서버에 보냅니다.
+    큐가 가득 차면 오래된 항목부터, 워커가 종료되면 아직 보내지 못한 항목은 버려집니다.
+    """
+
+    batch_method = None
+    max_pending = 1000
+
+    def __init__(self, name, local_factory, manager_method, *args):
+        self.name = name
+        self._local_factory = local_factory
+        self._manager_method = manager_method
+        self._args = args
+        self._pid = None
+        self._target = None
+        self._local = None
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _resolve(self):
+        pid = os.getpid()
+        if self._pid != pid:
+            with self._lock:
+                if self._pid != pid:
+                    self._reset()
+                    self._local = self._local_factory(*self._args)
+                    self._target = self._local
+                    if os.environ.get(ADDR_ENV):
+                        try:
+                            manager = _connect()
+                            self._target = getattr(manager, self._manager_method)(self.name, *self._args)
+                        except (OSError, EOFError) as e:
+                            logger.warning(f"로그 집계 서버에 접속하지 못해 프로세스별 {self.name}을(를) 사용합니다: {e}")
+                    self._pid = pid
+        return self._target
+
+    def _reset(self):
+        """처음 사용할 때와 fork 직후 부모 프로세스에서 물려받은 상태 정리"""
+        self._pending = deque(maxlen=self.max_pending)
+        self._wakeup = threading.Event()
+        self._flush_lock = threading.Lock()
+        self._flusher = None
+
+    def _call(self, method, *args):
+        target = self._resolve()
+        if target is not self._local:
+            try:
+                return getattr(target, method)(*args)
+            except (OSError, EOFError) as e:
+                logger.warning(f"로그 집계 서버 연결이 끊어져 프로세스별 {self.name}(으)로 전환합니다: {e}")
+                self._target = self._local
+        return getattr(self._local, method)(*args)
+
+    def _enqueue(self, item):
+        if self._resolve() is self._local:
+            getattr(self._local, self.batch_method)([item])
+            return
+        self._pending.append(item)
+        if self._flusher is None:
+            with self._lock:
+                if self._flusher is None:
+                    self._flusher = threading.Thread(target=self._flush_loop, name=f"{self.name}-flush", daemon=True)
+                    self._flusher.start()
+        self._wakeup.set()
+
+    def _flush_loop(self):
+        while True:
+            self._wakeup.wait()
+            self._wakeup.clear()
+            self.flush()
+            time.sleep(FLUSH_INTERVAL)
+
+    def flush(self):
+        """큐에 쌓인 항목을 집계 서버(또는 로컬 객체)로 보냄"""
+        with self._flush_lock:
+            items = []
+            while self._pending:
+                items.append(self._pending.popleft())
+            if items:
+                self._call(self.batch_method, items)
+
+    def snapshot(self):
+        self._resolve()
+        self.flush()
+        return self._call("snapshot")
+
+    def clear(self):
+        self._resolve()
+        self._pending.clear()
+        self._call("clear")
+
+
+class LogBuffer(_SharedObject):
+    """최근 maxlen개의 요청 로그를 보관하는 버퍼"""
+
+    batch_method = "extend"
+
+    def __init__(self, name, maxlen):
+        self.maxlen = maxlen
+        self.max_pending = maxlen
+        super().__init__(name, RingBuffer, "get_buffer", maxlen)
+
+    def append(self, item):
+        self._enqueue(item)
+
+
+class AttackStore(_SharedObject):
+    """
+    지문별로 집계된 공격 로그 저장소 (attack_store.AttackAggregator).
+    지문과 샘플은 요청을 받은 워커에서 계산해 크기가 제한된 이벤트만 모아서 보내고,
+    새 지문 여부는 워커마다 최근 본 지문 목록으로 판단합니다 (워커별로 한 번씩 새 지문이 됨).
+    """
+
+    batch_method = "add"
+    max_pending = 5000
+
+    def __init__(self, name, max_fingerprints=200):
+        self.max_fingerprints = max_fingerprints
+        super().__init__(name, AttackAggregator, "get_attack_store", max_fingerprints)
+
+    def _reset(self):
+        super()._reset()
+        self._seen = OrderedDict()
+        self._seen_lock = threading.Lock()
+
+    def record(self, log_data):
+        """공격 로그 한 건을 집계 큐에 넣고 (지문, 이 워커에서 처음 본 지문인지)를 반환"""
+        event = attack_event(log_data)
+        self._enqueue(event)
+        fp = event["fingerprint"]
+        with self._seen_lock:
+            is_new = fp not in self._seen
+            self._seen[fp] = True
+            self._seen.move_to_end(fp)
+            while len(self._seen) > self.max_fingerprints * 10:
+                self._seen.popitem(last=False)
+        return fp, is_new
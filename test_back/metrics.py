@@ -0,0 +1,360 @@
+from bisect import bisect_left
+import asyncio
+import cProfile
+import hmac
+import io
+import os
+import pstats
+import random
+import sys
+import threading
+import time
+
+# 지연 시간 히스토그램 구간 (초)
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# 라벨 조합이 무한히 늘어나지 않도록 시계열 개수 제한
+MAX_SERIES = 500
+OVERFLOW_LABEL = "<other>"
+
+PROFILE_TOKEN = os.environ.get("PROFILE_TOKEN", "")
+PROFILE_MAX_SECONDS = int(os.environ.get("PROFILE_MAX_SECONDS", 60))
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Python 3.12부터 cProfile은 sys.monitoring 기반이라 프로세스 전체에서 하나만 켤 수 있고
+# 모든 스레드의 호출을 기록하므로 요청별 샘플링 대신 구간 전체를 한 번에 프로파일링
+PER_REQUEST_PROFILING = sys.version_info < (3, 12)
+
+
+class Histogram:
+    """Prometheus 형식의 누적 히스토그램"""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self):
+        total = 0
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            total += count
+            yield bound, total
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names, values, extra=None):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}"
+
+
+def _format_bound(bound):
+    return "+Inf" if bound == float("inf") else repr(bound)
+
+
+class Metrics:
+    """라우트별 요청 수와 지연 시간, 업스트림 전달 시간을 수집"""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self._requests = {}
+        self._latency = {}
+        self._upstream = {}
+        self._upstream_errors = {}
+        self._lock = threading.Lock()
+
+    def _key(self, table, key, overflow):
+        if key not in table and len(table) >= MAX_SERIES:
+            return overflow
+        return key
+
+    def observe_request(self, method, route, status, seconds):
+        with self._lock:
+            key = self._key(self._requests, (method, route, str(status)), (method, OVERFLOW_LABEL, str(status)))
+            self._requests[key] = self._requests.get(key, 0) + 1
+
+            key = self._key(self._latency, (method, route), (method, OVERFLOW_LABEL))
+            histogram = self._latency.get(key)
+            if histogram is None:
+                histogram = self._latency[key] = Histogram(self.buckets)
+            histogram.observe(seconds)
+
+    def observe_upstream(self, upstream, seconds, error=False):
+        with self._lock:
+            key = self._key(self._upstream, (upstream,), (OVERFLOW_LABEL,))
+            histogram = self._upstream.get(key)
+            if histogram is None:
+                histogram = self._upstream[key] = Histogram(self.buckets)
+            histogram.observe(seconds)
+            if error:
+                self._upstream_errors[key] = self._upstream_errors.get(key, 0) + 1
+
+    def render(self):
+        """Prometheus 텍스트 형식으로 출력"""
+        lines = []
+        with self._lock:
+            lines.append("# HELP http_requests_total Total HTTP requests by route and status.")
+            lines.append("# TYPE http_requests_total counter")
+            for key, count in sorted(self._requests.items()):
+                lines.append(f"http_requests_total{_labels(('method', 'route', 'status'), key)} {count}")
+
+            self._render_histogram(lines, "http_request_duration_seconds",
+                                   "HTTP request latency by route.", ("method", "route"), self._latency)
+            self._render_histogram(lines, "upstream_request_duration_seconds",
+                                   "Time spent in upstream forwards.", ("upstream",), self._upstream)
+
+            lines.append("# HELP upstream_request_errors_total Failed upstream forwards.")
+            lines.append("# TYPE upstream_request_errors_total counter")
+            for key, count in sorted(self._upstream_errors.items()):
+                lines.append(f"upstream_request_errors_total{_labels(('upstream',), key)} {count}")
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def _render_histogram(lines, name, help_text, label_names, table):
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} histogram")
+        for key, histogram in sorted(table.items()):
+            for bound, total in histogram.cumulative():
+                le = f'le="{_format_bound(bound)}"'
+                lines.append(f"{name}_bucket{_labels(label_names, key, le)} {total}")
+            lines.append(f"{name}_sum{_labels(label_names, key)} {histogram.sum}")
+            lines.append(f"{name}_count{_labels(label_names, key)} {histogram.count}")
+
+
+class Profiler:
+    """
+    지정한 시간 동안 실제 요청의 일부를 cProfile로 샘플링하여 합산합니다.
+    한 번에 하나의 프로파일링 구간만 실행됩니다.
+    whole_process=True로 시작하면 요청별 샘플링 대신 구간 동안 Profile 하나를 켜 둡니다
+    (Python 3.12 이상 또는 이벤트 루프 스레드 하나에서 요청을 처리하는 서버).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._active = False
+        self._sample_rate = 1.0
+        self._stats = None
+        self._samples = 0
+        self._window = None
+
+    def start(self, sample_rate=1.0, whole_process=False):
+        """
+        프로파일링 구간을 시작합니다. 이미 진행 중이면 False를 반환하고,
+        whole_process 모드에서 다른 프로파일러가 동작 중이면 ValueError를 발생시킵니다.
+        """
+        with self._lock:
+            if self._active:
+                return False
+            window = None
+            if whole_process:
+                window = cProfile.Profile()
+                window.enable()
+            self._active = True
+            self._sample_rate = sample_rate
+            self._stats = None
+            self._samples = 0
+            self._window = window
+            return True
+
+    def begin_request(self):
+        """샘플링 대상이면 현재 스레드에서 프로파일링을 시작하고 Profile 객체를 반환"""
+        if not self._active or self._window is not None or random.random() >= self._sample_rate:
+            return None
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            # 다른 프로파일러가 이미 동작 중인 경우 이번 요청은 건너뜀
+            return None
+        return profile
+
+    def end_request(self, profile):
+        if profile is None:
+            return
+        profile.disable()
+        self.add(profile)
+
+    def add(self, profile):
+        with self._lock:
+            if not self._active:
+                return
+            try:
+                if self._stats is None:
+                    self._stats = pstats.Stats(profile)
+                else:
+                    self._stats.add(profile)
+                self._samples += 1
+            except TypeError:
+                # 호출 기록이 없는 프로파일
+                pass
+
+    def stop(self, limit=50):
+        """프로파일링을 끝내고 누적 시간 기준 상위 limit개 함수의 통계 텍스트 반환"""
+        window, self._window = self._window, None
+        if window is not None:
+            window.disable()
+            self.add(window)
+        with self._lock:
+            self._active = False
+            stats, samples = self._stats, self._samples
+            self._stats = None
+
+        if stats is None:
+            return "샘플링된 요청이 없습니다.\n"
+        out = io.StringIO()
+        stats.stream = out
+        stats.sort_stats("cumulative").print_stats(limit)
+        return f"샘플링된 요청: {samples}\n" + out.getvalue()
+
+
+def check_profile_request(args, headers):
+    """
+    /debug/profile 요청을 검증합니다.
+    PROFILE_TOKEN이 설정되지 않았으면 비활성화 상태입니다.
+    (상태 코드, 오류 메시지 또는 (초, 샘플링 비율)) 튜플을 반환합니다.
+    """
+    if not PROFILE_TOKEN:
+        return 404, "Not Found"
+    token = headers.get("X-Profile-Token") or args.get("token") or ""
+    if not hmac.compare_digest(token.encode(), PROFILE_TOKEN.encode()):
+        return 403, "Forbidden"
+    try:
+        seconds = float(args.get("seconds", 10))
+        sample_rate = float(args.get("rate", 1.0))
+    except ValueError:
+        return 400, "seconds와 rate는 숫자여야 합니다"
+    if not 0 < seconds <= PROFILE_MAX_SECONDS:
+        return 400, f"seconds는 0 초과 {PROFILE_MAX_SECONDS} 이하여야 합니다"
+    if not 0 < sample_rate <= 1:
+        return 400, "rate는 0 초과 1 이하여야 합니다"
+    return 200, (seconds, sample_rate)
+
+
+def init_metrics(app, metrics=None, profiler=None):
+    """
+    Flask 앱에 계측 미들웨어와 /metrics, /debug/profile 엔드포인트를 등록합니다.
+    요청 제한 등 다른 before_request 훅보다 먼저 실행되어 429 응답도 측정합니다.
+    Python 3.12 이상에서는 /debug/profile의 rate와 관계없이 구간 전체의 모든 스레드를 프로파일링합니다.
+    """
+    from flask import Response, g, request
+
+    if metrics is None:
+        metrics = Metrics()
+    if profiler is None:
+        profiler = Profiler()
+
+    def start_timer():
+        g._metrics_start = time.perf_counter()
+        g._profile = profiler.begin_request()
+
+    def record(response):
+        start = g.pop("_metrics_start", None)
+        if start is not None:
+            route = request.url_rule.rule if request.url_rule else OVERFLOW_LABEL
+            metrics.observe_request(request.method, route, response.status_code, time.perf_counter() - start)
+        return response
+
+    def finish_profile(exc):
+        profiler.end_request(g.pop("_profile", None))
+
+    app.before_request_funcs.setdefault(None, []).insert(0, start_timer)
+    app.after_request(record)
+    app.teardown_request(finish_profile)
+
+    def metrics_view():
+        return Response(metrics.render(), content_type=PROMETHEUS_CONTENT_TYPE)
+
+    def profile_view():
+        status, result = check_profile_request(request.args, request.headers)
+        if status != 200:
+            return Response(result, status=status, mimetype="text/plain")
+        seconds, sample_rate = result
+        try:
+            started = profiler.start(sample_rate, whole_process=not PER_REQUEST_PROFILING)
+        except ValueError:
+            return Response("다른 프로파일러가 동작 중입니다", status=409, mimetype="text/plain")
+        if not started:
+            return Response("이미 프로파일링이 진행 중입니다", status=409, mimetype="text/plain")
+        time.sleep(seconds)
+        return Response(profiler.stop(), mimetype="text/plain")
+
+    app.add_url_rule("/metrics", "metrics", metrics_view)
+    app.add_url_rule("/debug/profile", "debug_profile", profile_view)
+    app.extensions["metrics"] = metrics
+    return metrics
+
+
+def _route_path(app, scope):
+    route = scope.get("route")
+    if route is not None:
+        return route.path
+
+    from starlette.routing import Match
+
+    for route in app.router.routes:
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return getattr(route, "path", OVERFLOW_LABEL)
+    return OVERFLOW_LABEL
+
+
+def init_fastapi_metrics(app, metrics=None, profiler=None):
+    """
+    FastAPI 앱에 계측 미들웨어와 /metrics, /debug/profile 엔드포인트를 등록합니다.
+    비동기 서버는 이벤트 루프 스레드 하나에서 요청을 처리하므로
+    프로파일링 구간 동안 루프 스레드 전체를 프로파일링합니다.
+    """
+    from fastapi import Request
+    from fastapi.responses import PlainTextResponse, Response
+
+    if metrics is None:
+        metrics = Metrics()
+    if profiler is None:
+        profiler = Profiler()
+
+    @app.middleware("http")
+    async def record(request: Request, call_next):
+        start = time.perf_counter()
+        status = 500
+        try:
+            response = await call_next(request)
+            status = response.status_code
+            return response
+        finally:
+            metrics.observe_request(request.method, _route_path(app, request.scope), status,
+                                    time.perf_counter() - start)
+
+    async def metrics_view():
+        return Response(metrics.render(), media_type=PROMETHEUS_CONTENT_TYPE)
+
+    async def profile_view(request: Request):
+        status, result = check_profile_request(request.query_params, request.headers)
+        if status != 200:
+            return PlainTextResponse(result, status_code=status)
+        seconds, _ = result
+        try:
+            started = profiler.start(whole_process=True)
+        except ValueError:
+            return PlainTextResponse("다른 프로파일러가 동작 중입니다", status_code=409)
+        if not started:
+            return PlainTextResponse("이미 프로파일링이 진행 중입니다", status_code=409)
+        try:
+            await asyncio.sleep(seconds)
+        finally:
+            stats = profiler.stop()
+        return PlainTextResponse(stats)
+
+    app.add_api_route("/metrics", metrics_view, methods=["GET"], include_in_schema=False)
+    app.add_api_route("/debug/profile", profile_view, methods=["GET"], include_in_schema=False)
+    app.state.metrics = metrics
+    return metrics
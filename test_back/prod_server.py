@@ -1,6 +1,9 @@
 from flask import Flask, request, jsonify, render_template_string
 import logging
 import os
+from rate_limiter import init_rate_limiter
+from metrics import init_metrics
+from response_cache import CachedPage
 
 # 로깅 설정
 logging.basicConfig(level=logging.WARNING, format='%(asctime)s - [PROD] %(levelname)s - %(message)s')
@@ -8,10 +11,14 @@ logger = logging.getLogger(__name__)
 
 app = Flask(__name__)
 
-# 메인 페이지
-@app.route('/')
-def index():
-    return render_template_string("""
+# IP별 요청 제한
+rate_limiter = init_rate_limiter(app)
+
+# 라우트별 요청 수/지연 시간 계측 (/metrics, /debug/profile)
+metrics = init_metrics(app)
+
+# 메인 페이지 (시작 시 한 번만 렌더링)
+INDEX_PAGE = CachedPage.from_template(app, """
     <html>
     <head><title>prod</title></head>
     <body>
@@ -26,6 +33,10 @@ def index():
     </html>
     """)
 
+@app.route('/')
+def index():
+    return INDEX_PAGE.respond(request)
+
 # 취약한 로그인 엔드포인트 (SQL 인젝션에 취약)
 @app.route('/login', methods=['POST'])
 def login():
@@ -41,6 +52,9 @@ def login():
     # 로그인 성공 시뮬레이션
     return jsonify({"status": "success", "query": query})
 
+# 댓글 목록 페이지 (시작 시 한 번만 렌더링)
+COMMENTS_PAGE = CachedPage.from_template(app, "<h1>댓글</h1><form method='post'><input name='comment'><button>추가</button></form>")
+
 # XSS 취약점이 있는 댓글 시스템
 @app.route('/comments', methods=['GET', 'POST'])
 def comments():
@@ -50,8 +64,13 @@ def comments():
         return render_template_string("<p>댓글이 추가되었습니다: " + comment + "</p>")
     
     # 댓글 목록 표시
-    return render_template_string("<h1>댓글</h1><form method='post'><input name='comment'><button>추가</button></form>")
+    return COMMENTS_PAGE.respond(request)
 
 if __name__ == '__main__':
     port = int(os.environ.get('PORT', 8080))
-    app.run(host='0.0.0.0', port=port)
\ No newline at end of file
+    workers = int(os.environ.get('WORKERS', 1))
+    if workers > 1:
+        from serve import serve
+        serve(app, port=port, workers=workers)
+    else:
+        app.run(host='0.0.0.0', port=port)
\ No newline at end of file
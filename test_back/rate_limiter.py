@@ -0,0 +1,133 @@
+from flask import request, Response
+from collections import OrderedDict
+import logging
+import math
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class SlidingWindowLimiter:
+    """
+    IP별 슬라이딩 윈도우 카운터 기반 요청 제한기.
+    직전 윈도우와 현재 윈도우의 카운트 두 개만 보관하므로 요청당 O(1)로 갱신되고,
+    공격자로 표시된 IP는 일정 시간 동안 더 낮은 한도를 적용받습니다.
+    """
+
+    def __init__(self, limit=120, window=60.0, attacker_limit=10, penalty=300.0, max_keys=100000):
+        self.limit = limit
+        self.window = float(window)
+        self.attacker_limit = attacker_limit
+        self.penalty = float(penalty)
+        self.max_keys = max_keys
+        # 유휴 키 만료 시간 (패널티 기간 동안은 키를 유지)
+        self.idle_ttl = max(2 * self.window, self.penalty)
+        # ip -> [윈도우 시작, 직전 윈도우 카운트, 현재 윈도우 카운트, 패널티 만료, 마지막 요청 시각]
+        # 마지막 요청 순서대로 정렬되어 있어 앞쪽부터 유휴 키를 제거할 수 있음
+        self._clients = OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls):
+        """환경 변수로부터 설정을 읽어 생성"""
+        return cls(
+            limit=int(os.environ.get("RATE_LIMIT", 120)),
+            window=float(os.environ.get("RATE_LIMIT_WINDOW", 60)),
+            attacker_limit=int(os.environ.get("RATE_LIMIT_ATTACKER", 10)),
+            penalty=float(os.environ.get("RATE_LIMIT_PENALTY", 300)),
+        )
+
+    @property
+    def enabled(self):
+        return self.limit > 0
+
+    def _entry(self, ip, now):
+        entry = self._clients.get(ip)
+        if entry is None:
+            entry = [now, 0, 0, 0.0, now]
+            self._clients[ip] = entry
+        else:
+            self._clients.move_to_end(ip)
+            entry[4] = now
+        self._expire(now)
+        return entry
+
+    def _expire(self, now):
+        # 가장 오래된 키부터 확인하므로 상각 O(1)
+        while self._clients:
+            ip, oldest = next(iter(self._clients.items()))
+            if now - oldest[4] < self.idle_ttl and len(self._clients) <= self.max_keys:
+                break
+            self._clients.popitem(last=False)
+
+    def _roll(self, entry, now):
+        elapsed = now - entry[0]
+        if elapsed >= self.window:
+            entry[1] = entry[2] if elapsed < 2 * self.window else 0
+            entry[2] = 0
+            entry[0] = now - (elapsed % self.window)
+
+    def hit(self, ip, now=None):
+        """
+        요청 한 건을 기록합니다.
+        (허용 여부, 재시도까지 남은 초) 튜플을 반환합니다.
+        """
+        if not self.enabled:
+            return True, 0
+        if now is None:
+            now = time.monotonic()
+        with self._lock:
+            entry = self._entry(ip, now)
+            self._roll(entry, now)
+
+            offset = now - entry[0]
+            estimate = entry[1] * (1 - offset / self.window) + entry[2]
+            limit = self.attacker_limit if entry[3] > now else self.limit
+            if estimate >= limit:
+                return False, max(1, math.ceil(self.window - offset))
+
+            entry[2] += 1
+            return True, 0
+
+    def flag(self, ip, now=None):
+        """공격자로 탐지된 IP에 패널티 기간 동안 강화된 한도 적용"""
+        if not self.enabled:
+            return
+        if now is None:
+            now = time.monotonic()
+        with self._lock:
+            entry = self._entry(ip, now)
+            entry[3] = now + self.penalty
+
+    def is_flagged(self, ip, now=None):
+        if now is None:
+            now = time.monotonic()
+        with self._lock:
+            entry = self._clients.get(ip)
+            return entry is not None and entry[3] > now
+
+
+def init_rate_limiter(app, limiter=None):
+    """
+    Flask 앱에 요청 제한 미들웨어를 등록합니다.
+    다른 before_request 훅보다 먼저 실행되어 템플릿 렌더링이나 로깅 전에 429를 반환합니다.
+
+    제한 상태는 프로세스 메모리에만 있습니다. serve.py로 워커 N개를 띄우면 워커마다
+    카운터가 따로 있어 IP당 실제 한도는 최대 N × RATE_LIMIT가 되고, flag()로 표시한 공격자도
+    공격을 탐지한 워커에서만 강화된 한도를 적용받습니다. 정확한 제한이 필요하면 단일 프로세스로
+    실행하거나 앞단 프록시(nginx limit_req 등)에서 제한하세요.
+    """
+    if limiter is None:
+        limiter = SlidingWindowLimiter.from_env()
+
+    def check_rate_limit():
+        allowed, retry_after = limiter.hit(request.remote_addr)
+        if not allowed:
+            logger.warning(f"요청 제한 초과: {request.remote_addr} - {request.path}")
+            return Response("Too Many Requests", status=429, headers={"Retry-After": str(retry_after)})
+
+    app.before_request_funcs.setdefault(None, []).insert(0, check_rate_limit)
+    app.extensions["rate_limiter"] = limiter
+    return limiter
@@ -0,0 +1,52 @@
+from flask import Response
+import gzip
+import hashlib
+
+
+class CachedPage:
+    """
+    시작 시 한 번만 렌더링해 두는 고정 페이지 응답.
+    gzip 압축본과 ETag를 미리 계산해 두고 If-None-Match 요청에는 304를 반환합니다.
+    source는 페이지를 만든 템플릿 소스입니다 (성능 비교 등 참고용, 없으면 None).
+    """
+
+    def __init__(self, body, mimetype="text/html", source=None):
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        self.body = body
+        self.mimetype = mimetype
+        self.source = source
+        self.etag = hashlib.sha1(body).hexdigest()[:16]
+
+        # 압축 효과가 없는 작은 페이지는 원본만 제공
+        compressed = gzip.compress(body, compresslevel=9, mtime=0)
+        if len(compressed) < len(body):
+            self.gzip_body = compressed
+            self.gzip_etag = self.etag + "-gz"
+        else:
+            self.gzip_body = None
+            self.gzip_etag = None
+
+    @classmethod
+    def from_template(cls, app, source, **context):
+        """템플릿 소스를 컴파일하고 렌더링한 결과로 생성"""
+        return cls(app.jinja_env.from_string(source).render(**context), source=source)
+
+    def respond(self, request):
+        """요청의 Accept-Encoding / If-None-Match 헤더에 맞는 응답 생성"""
+        use_gzip = self.gzip_body is not None and request.accept_encodings["gzip"] > 0
+        etag = self.gzip_etag if use_gzip else self.etag
+
+        headers = {"Vary": "Accept-Encoding"}
+        if request.if_none_match.contains(etag):
+            response = Response(status=304, headers=headers)
+            response.set_etag(etag)
+            return response
+
+        if use_gzip:
+            headers["Content-Encoding"] = "gzip"
+            response = Response(self.gzip_body, mimetype=self.mimetype, headers=headers)
+        else:
+            response = Response(self.body, mimetype=self.mimetype, headers=headers)
+        response.set_etag(etag)
+        return response
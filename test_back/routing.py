@@ -0,0 +1,168 @@
+"""
+attack.py 전달 대상 라우팅 테이블.
+
+라우팅 파일(JSON) 예시:
+    {
+        "dns_ttl": 60,
+        "pool_size": 20,
+        "routes": {
+            "auth-server": ["http://10.0.0.5:8081", "http://10.0.0.6:8081"],
+            "localhost:8081": ["http://127.0.0.1:8081"],
+            "default": ["http://127.0.0.1:8081"]
+        }
+    }
+
+routes의 키는 로그의 source 값 또는 Host 헤더 값이며, 어느 것에도 해당하지 않으면
+"default" 풀을 사용합니다. 풀이 없으면 전달하지 않습니다.
+파일이 바뀌면 다음 요청 때 다시 읽어 적용합니다 (서버 재시작 불필요).
+dns_ttl과 pool_size는 연결 풀을 만드는 시작 시점의 값이 적용됩니다.
+"""
+from urllib.parse import urlsplit
+import json
+import logging
+import os
+import time
+
+import aiohttp
+
+logger = logging.getLogger("LogReceiver")
+
+DEFAULT_ROUTE = "default"
+RELOAD_INTERVAL = 2.0  # 라우팅 파일 변경 확인 주기 (초)
+FAILURE_COOLDOWN = 10.0  # 실패한 업스트림을 제외하는 시간 (초)
+
+
+class UpstreamPool:
+    """업스트림 인스턴스 목록을 라운드 로빈으로 분산하고, 실패한 인스턴스는 잠시 제외"""
+
+    def __init__(self, name, urls):
+        self.name = name
+        self.urls = [url.rstrip("/") for url in urls]
+        self._next = 0
+        self._down_until = {}
+
+    def pick(self):
+        now = time.monotonic()
+        for _ in range(len(self.urls)):
+            url = self.urls[self._next % len(self.urls)]
+            self._next += 1
+            if self._down_until.get(url, 0) <= now:
+                return url
+        # 모두 실패 상태이면 그래도 순서대로 시도
+        url = self.urls[self._next % len(self.urls)]
+        self._next += 1
+        return url
+
+    def mark_failed(self, url):
+        self._down_until[url] = time.monotonic() + FAILURE_COOLDOWN
+
+    def mark_ok(self, url):
+        self._down_until.pop(url, None)
+
+
+def _validate_url(url):
+    parts = urlsplit(url)
+    if parts.scheme not in ("http", "https") or not parts.hostname:
+        raise ValueError(f"잘못된 업스트림 주소: {url}")
+    return url
+
+
+class Router:
+    """
+    라우팅 테이블과 업스트림별 keep-alive 연결 풀.
+    aiohttp 커넥터가 호스트별 연결을 재사용하고 DNS 조회 결과를 dns_ttl초 동안 캐시하므로
+    이벤트마다 새 연결과 DNS 조회가 발생하지 않습니다.
+    """
+
+    def __init__(self, routes_file=None, default_url=None, dns_ttl=60, pool_size=20):
+        self.routes_file = routes_file
+        self.default_url = default_url
+        self.dns_ttl = dns_ttl
+        self.pool_size = pool_size
+        self.pools = {}
+        self.session = None
+        self._mtime = None
+        self._loaded = False
+        self._checked_at = 0.0
+        self.load()
+
+    def load(self):
+        """
+        라우팅 파일을 읽어 풀을 구성하고 성공 여부를 반환합니다. 실패하면 기존 테이블을 유지하고,
+        처음 읽을 때 실패했다면 default_url만으로 테이블을 구성합니다.
+        읽기에 성공한 경우에만 수정 시각을 기록하므로 실패한 파일은 다음 확인 때 다시 읽습니다.
+        """
+        config = {"routes": {}}
+        routes = {}
+        ok = True
+        if self.routes_file:
+            try:
+                mtime = os.path.getmtime(self.routes_file)
+                with open(self.routes_file, encoding="utf-8") as f:
+                    config = json.load(f)
+                routes = {
+                    key: [_validate_url(url) for url in ([urls] if isinstance(urls, str) else urls)]
+                    for key, urls in config.get("routes", {}).items()
+                }
+            except (OSError, ValueError, AttributeError, TypeError) as e:
+                logger.error(f"라우팅 파일을 읽지 못했습니다 ({self.routes_file}): {e}")
+                if self._loaded:
+                    return False
+                config, routes, ok = {"routes": {}}, {}, False
+            else:
+                self._mtime = mtime
+
+        if DEFAULT_ROUTE not in routes and self.default_url:
+            parts = urlsplit(self.default_url)
+            routes[DEFAULT_ROUTE] = [f"{parts.scheme}://{parts.netloc}"]
+
+        # URL 목록이 같은 풀은 라운드 로빈/실패 상태를 그대로 유지
+        pools = {}
+        for key, urls in routes.items():
+            if not urls:
+                continue
+            old = self.pools.get(key)
+            pools[key] = old if old is not None and old.urls == [url.rstrip("/") for url in urls] else UpstreamPool(key, urls)
+        self.pools = pools
+        self.dns_ttl = config.get("dns_ttl", self.dns_ttl)
+        self.pool_size = config.get("pool_size", self.pool_size)
+        self._loaded = True
+        logger.info(f"라우팅 테이블 로드: { {key: pool.urls for key, pool in pools.items()} }")
+        return ok
+
+    def reload_if_changed(self):
+        if not self.routes_file:
+            return
+        now = time.monotonic()
+        if now - self._checked_at < RELOAD_INTERVAL:
+            return
+        self._checked_at = now
+        try:
+            mtime = os.path.getmtime(self.routes_file)
+        except OSError:
+            return
+        if mtime != self._mtime:
+            self.load()
+
+    def resolve(self, source=None, host=None):
+        """source → Host → default 순서로 풀을 찾아 (풀, 업스트림 URL)을 반환"""
+        self.reload_if_changed()
+        for key in (source, host, DEFAULT_ROUTE):
+            if key and key in self.pools:
+                pool = self.pools[key]
+                return pool, pool.pick()
+        return None, None
+
+    async def start(self):
+        connector = aiohttp.TCPConnector(
+            limit=0,
+            limit_per_host=self.pool_size,
+            ttl_dns_cache=self.dns_ttl,
+            keepalive_timeout=60,
+        )
+        self.session = aiohttp.ClientSession(connector=connector)
+
+    async def close(self):
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
@@ -0,0 +1,159 @@
+"""
+멀티 프로세스 운영 서버 실행기.
+
+사용법: python serve.py <모듈>[:<앱 변수>] [--host HOST] [--port PORT] [--workers N]
+예)    python serve.py prod_server --workers 4
+       python test_back/serve.py app:app --port 5000   (저장소 루트에서)
+
+부모 프로세스가 소켓을 먼저 열고 워커를 fork(preforking)하여 모든 워커가 같은 소켓에서
+요청을 받습니다. 로그 집계 서버를 함께 띄워 dev_server의 요청/공격 로그를 워커 간에 공유하고,
+종료된 워커는 자동으로 다시 시작합니다.
+
+주의: 요청 제한(rate_limiter)은 워커별로 동작합니다. IP당 한도는 최대 워커 수 × RATE_LIMIT이고,
+공격자 표시도 공격을 탐지한 워커에만 적용됩니다 (rate_limiter.init_rate_limiter 참고).
+"""
+import importlib
+import logging
+import os
+import signal
+import socket
+import sys
+import time
+
+from log_aggregator import ADDR_ENV, start_aggregator
+
+logger = logging.getLogger("serve")
+
+HOST = os.environ.get("HOST", "0.0.0.0")
+WORKERS = int(os.environ.get("WORKERS", os.cpu_count() or 1))
+RESPAWN_BACKOFF_MAX = 30.0  # 워커가 연달아 죽을 때 다시 시작하기까지 최대 대기 시간 (초)
+MIN_WORKER_UPTIME = 5.0  # 이 시간보다 빨리 죽으면 시작 실패로 보고 대기 시간을 늘림 (초)
+
+
+def load_app(target):
+    """'module' 또는 'module:attr' 형식의 문자열로 WSGI 앱을 불러옴"""
+    module_name, _, attr = target.partition(":")
+    module = importlib.import_module(module_name)
+    return getattr(module, attr or "app")
+
+
+def _run_worker(app, host, port, sock):
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    try:
+        from werkzeug.serving import make_server
+
+        server = make_server(host, port, app, threaded=True, fd=sock.fileno())
+        server.serve_forever()
+    except Exception:
+        logger.exception(f"워커 {os.getpid()} 오류")
+        os._exit(1)
+    os._exit(0)
+
+
+def serve(app, host=HOST, port=8080, workers=WORKERS):
+    """
+    preforking 방식으로 app을 workers개의 프로세스에서 실행합니다.
+    fork를 지원하지 않는 환경에서는 단일 프로세스로 실행합니다.
+    """
+    # 여러 프로세스에서 디버거/리로더를 켜면 안 되므로 운영 모드로 고정
+    app.debug = False
+
+    if not hasattr(os, "fork") or workers <= 1:
+        if workers > 1:
+            logger.warning("fork를 지원하지 않는 환경이므로 단일 프로세스로 실행합니다.")
+        app.run(host=host, port=port, threaded=True)
+        return
+
+    # 워커들이 같은 로그 버퍼를 보도록 fork 전에 집계 서버를 띄움
+    aggregator = None
+    if not os.environ.get(ADDR_ENV):
+        aggregator = start_aggregator()
+
+    sock = socket.create_server((host, port), backlog=1024)
+    sock.set_inheritable(True)
+
+    children = {}  # pid -> 시작 시각
+    stopping = False
+    backoff = 0.0
+    respawn_at = []  # 다시 시작할 예정 시각 목록
+
+    def spawn():
+        pid = os.fork()
+        if pid == 0:
+            _run_worker(app, host, port, sock)
+        children[pid] = time.monotonic()
+
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for pid in list(children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    for _ in range(workers):
+        spawn()
+    print(f"{host}:{port}에서 워커 {workers}개로 서비스 시작 (master pid {os.getpid()})")
+
+    # 집계 서버 프로세스는 건드리지 않도록 워커 pid만 개별적으로 확인
+    # 시작하자마자 죽는 워커는 대기 시간을 두 배씩 늘려 가며(최대 RESPAWN_BACKOFF_MAX) 다시 시작
+    while children or (respawn_at and not stopping):
+        now = time.monotonic()
+        for pid, started in list(children.items()):
+            try:
+                done, status = os.waitpid(pid, os.WNOHANG)
+            except ChildProcessError:
+                done, status = pid, 0
+            if not done:
+                continue
+            del children[pid]
+            if stopping:
+                continue
+            if now - started < MIN_WORKER_UPTIME:
+                backoff = min(max(backoff * 2, 1.0), RESPAWN_BACKOFF_MAX)
+            else:
+                backoff = 0.0
+            logger.warning(f"워커 {pid} 종료 (status {status}), {backoff:.0f}초 후 다시 시작합니다.")
+            respawn_at.append(now + backoff)
+        if not stopping:
+            for when in sorted(respawn_at):
+                if when <= now:
+                    respawn_at.remove(when)
+                    spawn()
+        time.sleep(0.5)
+
+    sock.close()
+    if aggregator is not None:
+        aggregator.shutdown()
+
+
+def main():
+    if len(sys.argv) < 2:
+        print("사용법: python serve.py <모듈>[:<앱 변수>] [--host HOST] [--port PORT] [--workers N]")
+        return
+
+    target = sys.argv[1]
+    host = HOST
+    port = int(os.environ.get("PORT", 8080))
+    workers = WORKERS
+
+    for i in range(2, len(sys.argv) - 1):
+        if sys.argv[i] == "--host":
+            host = sys.argv[i + 1]
+        elif sys.argv[i] == "--port":
+            port = int(sys.argv[i + 1])
+        elif sys.argv[i] == "--workers":
+            workers = int(sys.argv[i + 1])
+
+    # 현재 디렉토리의 모듈(예: 저장소 루트의 app.py)도 불러올 수 있도록 경로 추가
+    sys.path.insert(0, os.getcwd())
+    serve(load_app(target), host=host, port=port, workers=workers)
+
+
+if __name__ == "__main__":
+    main()
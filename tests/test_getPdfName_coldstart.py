@@ -0,0 +1,37 @@
+"""getPdfName.py 콜드 스타트 회귀 테스트 (무거운 의존성 없이 빠르게 import되는지)"""
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 새 인터프리터에서 import getPdfName에 걸리는 시간 상한 (초)
+IMPORT_BUDGET = float(os.environ.get("GETPDFNAME_IMPORT_BUDGET", 0.5))
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import getPdfName
+elapsed = time.perf_counter() - start
+print(json.dumps({
+    "elapsed": elapsed,
+    "modules": [name for name in ("pandas", "openpyxl", "numpy") if name in sys.modules],
+}))
+"""
+
+
+def _probe():
+    result = subprocess.run([sys.executable, "-c", PROBE], cwd=ROOT,
+                            capture_output=True, text=True, check=True)
+    return json.loads(result.stdout)
+
+
+def test_import_does_not_load_heavy_modules():
+    assert _probe()["modules"] == []
+
+
+def test_import_time_within_budget():
+    # 디스크 캐시 등의 영향을 줄이기 위해 가장 빠른 값을 사용
+    elapsed = min(_probe()["elapsed"] for _ in range(3))
+    assert elapsed < IMPORT_BUDGET, f"import getPdfName {elapsed * 1000:.1f}ms > {IMPORT_BUDGET * 1000:.0f}ms"